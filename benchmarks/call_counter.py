@@ -0,0 +1,42 @@
+"""Counts the calls a makedoc command makes to the functions of os that hit the
+file system
+
+install() is called in the process of the command, before the cli is imported.
+It wraps the functions of COUNTED_FUNCTIONS, which os.path, os.walk and pathlib
+call too, and the counts are written as JSON when the process exits. The calls
+of the processes started with --jobs are not counted, nor are those the entries
+of os.scandir make to get their own stat.
+"""
+
+import atexit
+import json
+import os
+from typing import Callable, Dict
+
+COUNTED_FUNCTIONS = ("stat", "lstat", "scandir")
+
+
+def _counting(counts: Dict[str, int], name: str, function: Callable) -> Callable:
+    """Wraps a function so that its calls are counted"""
+
+    def wrapper(*args, **kwargs):
+        counts[name] += 1
+        return function(*args, **kwargs)
+
+    return wrapper
+
+
+def _dump(counts: Dict[str, int], output_path: str) -> None:
+    """Writes the counts to a file in the json format"""
+    with open(output_path, "w") as f:
+        json.dump(counts, f)
+
+
+def install(output_path: str) -> None:
+    """Counts the calls to the functions of COUNTED_FUNCTIONS until the process
+    exits, and then writes the counts to a file
+    """
+    counts = dict.fromkeys(COUNTED_FUNCTIONS, 0)
+    for name in COUNTED_FUNCTIONS:
+        setattr(os, name, _counting(counts, name, getattr(os, name)))
+    atexit.register(_dump, counts, output_path)
@@ -0,0 +1,106 @@
+"""Checks the time the makedoc cli takes to import what it needs to start
+
+The help and the shell completion import the cli without running any command,
+so they should not import the parsers. The cli is started in new processes with
+python -X importtime, and the check fails if the cumulative import time of
+makedoc.cli.main exceeds the budget, or if a module of FORBIDDEN_MODULES is
+imported:
+
+    python benchmarks/check_import_time.py --budget-ms 80
+"""
+
+import os
+import pathlib
+import subprocess
+import sys
+from typing import Dict, List
+
+import click
+
+SOURCES = pathlib.Path(__file__).resolve().parent.parent / "src"
+
+MAKEDOC_MAIN = (
+    "import sys; sys.argv[0] = 'makedoc'; from makedoc.cli.main import cli; cli()"
+)
+
+# The modules only the commands need, which the help must not import
+FORBIDDEN_MODULES = [
+    "concurrent.futures",
+    "json",
+    "makedoc.logging",
+    "makedoc.makedoc_paths",
+    "makedoc.parsers",
+    "sqlite3",
+]
+
+
+def import_times(*args: str) -> Dict[str, int]:
+    """Starts the cli in a new process and gets the cumulative import time of
+    each module, in microseconds
+    """
+    env = dict(os.environ, PYTHONPATH=str(SOURCES))
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", MAKEDOC_MAIN, *args],
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        text=True,
+    )
+    times = {}
+    for line in process.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:") :].split("|")
+        times[name.strip()] = int(cumulative)
+    return times
+
+
+def forbidden_imports(modules: List[str]) -> List[str]:
+    """Lists the imported modules that belong to FORBIDDEN_MODULES"""
+    return [
+        module
+        for module in modules
+        if any(
+            module == forbidden or module.startswith(forbidden + ".")
+            for forbidden in FORBIDDEN_MODULES
+        )
+    ]
+
+
+@click.command()
+@click.option(
+    "-b",
+    "--budget-ms",
+    type=float,
+    default=80.0,
+    help="The maximal import time of makedoc.cli.main, in milliseconds",
+)
+@click.option(
+    "-n",
+    "--repeat",
+    default=5,
+    help="The number of runs, the fastest one being kept",
+)
+def check_import_time(budget_ms, repeat):
+    """Checks the import time of the cli against a budget"""
+    runs = [import_times("--help") for _ in range(repeat)]
+    main_ms = min(times["makedoc.cli.main"] for times in runs) / 1000
+    click_ms = min(times["click"] for times in runs) / 1000
+    print(f"makedoc.cli.main: {main_ms:.1f}ms (of which click: {click_ms:.1f}ms)")
+    print(f"Budget:           {budget_ms:.1f}ms")
+
+    failures = []
+    if main_ms > budget_ms:
+        failures.append(
+            f"The import time exceeds the budget by {main_ms - budget_ms:.1f}ms"
+        )
+    forbidden = forbidden_imports(sorted(runs[0]))
+    if forbidden:
+        failures.append(f"The help imports {', '.join(forbidden)}")
+    for failure in failures:
+        print(failure)
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    check_import_time()
@@ -0,0 +1,97 @@
+"""Measures the memory taken by the parser tree of a synthetic project
+
+The tree is fully built, lazily, after the ignore rules and the packed doc are
+loaded, so that only the parsers are measured, with tracemalloc:
+
+    python benchmarks/memory_benchmark.py -s 50k-files
+"""
+
+import json
+import pathlib
+import sys
+import tempfile
+import tracemalloc
+from typing import Any, Dict
+
+import click
+from synthetic_project import SHAPES, generate_project
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parent.parent / "src"))
+
+from makedoc.makedoc_paths import MakedocPaths  # noqa: E402
+from makedoc.parsers.directory_parser import DirectoryParser  # noqa: E402
+from makedoc.parsers.source_directory_parser import (  # noqa: E402
+    SourceDirectoryParser,
+)
+
+
+def measure_tree(root: pathlib.Path) -> Dict[str, Any]:
+    """Builds the whole parser tree of a project and measures its memory"""
+    makedoc_paths = MakedocPaths(root)
+    makedoc_paths.ignore_rules
+    makedoc_paths.packed_doc_store.get("")
+
+    tracemalloc.start()
+    parser = DirectoryParser(
+        path=root, root_path=root, makedoc_path=makedoc_paths, lazy=True
+    )
+    n_directories = 0
+    n_files = 0
+    directories = [parser]
+    while directories:
+        directory = directories.pop()
+        n_directories += 1
+        n_files += len(directory.file_names)
+        directories += directory.dir_children
+    tree_bytes, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "directories": n_directories,
+        "files": n_files,
+        "bytes": tree_bytes,
+        "bytes-per-node": tree_bytes / (n_directories + n_files),
+    }
+
+
+@click.command()
+@click.option(
+    "-s",
+    "--shape",
+    type=click.Choice(sorted(SHAPES)),
+    default="50k-files",
+    help="The shape of the project",
+)
+@click.option(
+    "-o",
+    "--output",
+    type=click.Path(dir_okay=False),
+    default=None,
+    help="Also writes the results to this JSON file",
+)
+def memory_benchmark(shape, output):
+    """Prints the memory taken by the parser tree of a synthetic project"""
+    with tempfile.TemporaryDirectory(prefix="makedoc-memory-") as temp_dir:
+        root = pathlib.Path(temp_dir) / shape
+        generate_project(root, SHAPES[shape])
+        # Writes the config files, as makedoc init does
+        SourceDirectoryParser._init_makedoc_file_structure(MakedocPaths(root))
+        results = measure_tree(root)
+
+    print(f"Directories:    {results['directories']}")
+    print(f"Files:          {results['files']}")
+    print(f"Tree size:      {results['bytes']} bytes")
+    print(f"Bytes per node: {results['bytes-per-node']:.0f}")
+    if output is not None:
+        with open(output, "w") as f:
+            json.dump(
+                {"shape": shape, **results},
+                f,
+                indent=4,
+                separators=(",", ": "),
+                sort_keys=True,
+            )
+
+
+if __name__ == "__main__":
+    memory_benchmark()
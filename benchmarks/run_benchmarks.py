@@ -0,0 +1,602 @@
+"""Runs the makedoc benchmarks on synthetic projects and stores the results as JSON
+
+The commands are run end to end, in a new process as a user would, against the
+makedoc sources of this repository. The parser methods are run in the process of
+the benchmarks. Results of two commits can then be compared:
+
+    python benchmarks/run_benchmarks.py run -s wide -s deep -n 5
+    python benchmarks/run_benchmarks.py compare before.json after.json
+
+The cost of is_ignored as the number of literal and glob rules grows is timed
+on a small project of its own with --ignore-rules-sweep.
+"""
+
+import contextlib
+import gc
+import json
+import os
+import pathlib
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+from datetime import datetime
+from time import perf_counter
+from typing import (Any, Callable, Dict, Iterator, List, NamedTuple, Optional,
+                    Tuple)
+
+import click
+from synthetic_project import (DEFAULT_SHAPES, SHAPES, ProjectShape,
+                               count_entries, generate_project)
+
+REPO_ROOT = pathlib.Path(__file__).resolve().parent.parent
+SOURCES = REPO_ROOT / "src"
+BENCHMARKS = REPO_ROOT / "benchmarks"
+RESULTS = BENCHMARKS / "results"
+
+sys.path.insert(0, str(SOURCES))
+
+from makedoc.ignore_rules import IgnoreRules  # noqa: E402
+from makedoc.makedoc_paths import MakedocPaths  # noqa: E402
+from makedoc.parsers.directory_parser import DirectoryParser  # noqa: E402
+from makedoc.parsers.pyscript_parser import PyscriptParser  # noqa: E402
+
+# The numbers of rules is_ignored is timed with, always on the same small project
+# since the cost of the glob rules grows with their number for every entry
+IGNORE_RULES_SWEEP = [10, 100, 1000, 10000]
+IGNORE_RULES_SWEEP_SHAPE = ProjectShape(width=6, depth=2, files_per_dir=10)
+
+MAKEDOC_MAIN = (
+    "import sys; sys.argv[0] = 'makedoc'; from makedoc.cli.main import cli; cli()"
+)
+
+# Runs makedoc with its file system calls counted, the first argument being the
+# file the counts are written to
+COUNTING_MAKEDOC_MAIN = (
+    "import sys; from call_counter import install; install(sys.argv.pop(1)); "
+    + MAKEDOC_MAIN
+)
+
+
+class Case(NamedTuple):
+    """A benchmark case
+
+    Attributes:
+        name (str)
+            The name of the case in the results
+        setup (Callable[[pathlib.Path], Any])
+            Prepares the project before each run, out of the timing. What it
+            returns is given to run.
+        run (Callable[[pathlib.Path, Any], Any])
+            The timed part of the case
+        counted (bool)
+            Whether run returns counts of what it did, reported along with the
+            timings
+    """
+
+    name: str
+    setup: Callable[[pathlib.Path], Any]
+    run: Callable[[pathlib.Path, Any], Any]
+    counted: bool = False
+
+
+def makedoc(root: pathlib.Path, *args: str) -> None:
+    """Runs a makedoc command on a project, in a new process"""
+    _run_makedoc(root, MAKEDOC_MAIN, *args)
+
+
+def counted_makedoc(root: pathlib.Path, *args: str) -> Dict[str, int]:
+    """Runs a makedoc command on a project, in a new process, and counts its calls
+    to os.stat, os.lstat and os.scandir
+    """
+    with tempfile.TemporaryDirectory(prefix="makedoc-counts-") as temp_dir:
+        counts_path = os.path.join(temp_dir, "counts.json")
+        _run_makedoc(root, COUNTING_MAKEDOC_MAIN, counts_path, *args)
+        with open(counts_path, "r") as f:
+            return json.load(f)
+
+
+def _run_makedoc(root: pathlib.Path, main: str, *args: str) -> None:
+    """Runs the code starting makedoc in a new process, in a project"""
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join([str(SOURCES), str(BENCHMARKS)]))
+    process = subprocess.run(
+        [sys.executable, "-c", main, *args],
+        cwd=root,
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        text=True,
+    )
+    if process.returncode != 0:
+        raise click.ClickException(
+            f"makedoc {' '.join(args)} failed:\n{process.stderr}"
+        )
+
+
+def _remove(*paths: pathlib.Path) -> None:
+    """Removes files or directories, if they exist"""
+    for path in paths:
+        if path.is_dir():
+            shutil.rmtree(path)
+        elif path.exists():
+            path.unlink()
+
+
+def _remove_init_outputs(root: pathlib.Path) -> None:
+    """Removes what makedoc init creates, except the files of the generator"""
+    makedoc_paths = MakedocPaths(root)
+    _remove(
+        makedoc_paths.config_json,
+        makedoc_paths.files_naming,
+        makedoc_paths.logs,
+        makedoc_paths.cache,
+        makedoc_paths.render_cache_path,
+    )
+    _remove_readmes(root)
+
+
+def _remove_readmes(root: pathlib.Path) -> None:
+    """Removes the doc files and the render cache"""
+    _remove(MakedocPaths(root).render_cache_path, *root.rglob("README.md"))
+
+
+def _empty_readmes(root: pathlib.Path) -> None:
+    """Empties the doc file of every directory, for update to write them all"""
+    _remove_readmes(root)
+    for directory, dir_names, _ in os.walk(root):
+        dir_names[:] = [name for name in dir_names if name != ".makedoc"]
+        open(os.path.join(directory, "README.md"), "w").close()
+
+
+def _warm_parse_cache(root: pathlib.Path, jobs_args: Tuple[str, ...]) -> None:
+    """Fills the parse cache, if needed"""
+    if not MakedocPaths(root).parse_cache.db_path.exists():
+        makedoc(root, "check", "-r", *jobs_args)
+
+
+def command_cases(jobs: int) -> List[Case]:
+    """Lists the end to end cases, those supporting it being run with jobs"""
+    jobs_args = ("-j", str(jobs)) if jobs > 1 else ()
+    return [
+        Case("startup", lambda root: None, lambda root, _: makedoc(root, "--version")),
+        Case("init", _remove_init_outputs, lambda root, _: makedoc(root, "init")),
+        Case(
+            "check -r (cold parse cache)",
+            lambda root: _remove(MakedocPaths(root).cache),
+            lambda root, _: makedoc(root, "check", "-r", *jobs_args),
+        ),
+        Case(
+            "check -r (warm parse cache)",
+            lambda root: _warm_parse_cache(root, jobs_args),
+            lambda root, _: makedoc(root, "check", "-r", *jobs_args),
+        ),
+        Case(
+            "update -r (empty doc files)",
+            _empty_readmes,
+            lambda root, _: makedoc(root, "update", "-r", *jobs_args),
+        ),
+        Case(
+            "update -r (up to date)",
+            lambda root: None,
+            lambda root, _: makedoc(root, "update", "-r", *jobs_args),
+        ),
+        Case(
+            "check -r (counted file system calls)",
+            lambda root: _warm_parse_cache(root, ()),
+            lambda root, _: counted_makedoc(root, "check", "-r"),
+            counted=True,
+        ),
+        Case(
+            "update -r (counted file system calls)",
+            lambda root: None,
+            lambda root, _: counted_makedoc(root, "update", "-r"),
+            counted=True,
+        ),
+        Case(
+            "unpack -r",
+            lambda root: makedoc(root, "pack", "-r"),
+            lambda root, _: makedoc(root, "unpack", "-r"),
+        ),
+        Case(
+            "pack -r",
+            lambda root: makedoc(root, "unpack", "-r"),
+            lambda root, _: makedoc(root, "pack", "-r"),
+        ),
+    ]
+
+
+def _iter_nodes(parser: DirectoryParser) -> Iterator[DirectoryParser]:
+    """Iterates over the directories of a tree, loading their children"""
+    yield parser
+    for child in parser.dir_children:
+        yield from _iter_nodes(child)
+
+
+def _load_tree(root: pathlib.Path) -> DirectoryParser:
+    """Builds the tree of a project, with a new cache of its makedoc paths"""
+    parser = DirectoryParser(path=root, root_path=root, lazy=True)
+    for directory in _iter_nodes(parser):
+        directory.file_names
+    return parser
+
+
+def _py_files(parser: DirectoryParser) -> List[PyscriptParser]:
+    """Lists the python files of a loaded tree"""
+    return [
+        file
+        for directory in _iter_nodes(parser)
+        for file in directory.doc_file_children
+        if isinstance(file, PyscriptParser)
+    ]
+
+
+def _parse(files: List[PyscriptParser]) -> None:
+    """Extracts the docstrings of python files and flushes the parse cache"""
+    for file in files:
+        file.get_parsed_doc()
+    if files:
+        files[0].makedoc_paths.parse_cache.flush()
+
+
+def _find_docstrings(files: List[PyscriptParser]) -> None:
+    """Searches the docstrings of python files in their whole content, read with
+    content_txt_lines, as before the docstring search was bounded
+    """
+    for file in files:
+        file._find_beginning_comment_lines(iter(file.content_txt_lines))
+
+
+def _find_docstrings_bounded(files: List[PyscriptParser]) -> None:
+    """Searches the docstrings of python files in their first
+    MAX_DOCSTRING_SEARCH_CHARS characters, read line by line
+    """
+    for file in files:
+        with contextlib.closing(
+            file.iter_content_txt_lines(max_chars=file.MAX_DOCSTRING_SEARCH_CHARS)
+        ) as lines:
+            file._find_beginning_comment_lines(lines)
+
+
+def _setup_cold_parse(root: pathlib.Path) -> List[PyscriptParser]:
+    """Removes the parse cache and lists the python files of a new tree"""
+    _remove(MakedocPaths(root).cache)
+    return _py_files(_load_tree(root))
+
+
+def _setup_warm_parse(root: pathlib.Path) -> List[PyscriptParser]:
+    """Fills the parse cache, if needed, and lists the python files of a new tree"""
+    if not MakedocPaths(root).parse_cache.db_path.exists():
+        _parse(_py_files(_load_tree(root)))
+    return _py_files(_load_tree(root))
+
+
+def _list_entries(root: pathlib.Path) -> List[Tuple]:
+    """Lists the arguments of is_ignored for every entry of the project"""
+    entries = []
+    for directory, dir_names, file_names in os.walk(root):
+        dir_names[:] = [name for name in dir_names if name != ".makedoc"]
+        for name, is_file in [(name, False) for name in dir_names] + [
+            (name, True) for name in file_names
+        ]:
+            path = os.path.join(directory, name)
+            entries.append((path, os.path.relpath(path, root), name, is_file))
+    return entries
+
+
+def _setup_is_ignored(root: pathlib.Path) -> Tuple[IgnoreRules, List[Tuple]]:
+    """Reads the ignore rules and lists the arguments of is_ignored for every entry
+    of the project
+    """
+    return IgnoreRules.from_makedoc_paths(MakedocPaths(root)), _list_entries(root)
+
+
+def _sweep_rules(entries: List[Tuple], n_rules: int, glob: bool) -> List[str]:
+    """Builds the rules of the sweep, one in a hundred matching an entry of the
+    project
+
+    The glob rules mix the usual kinds of .gitignore lines: names, extensions,
+    paths from the root, whole directories, names in a directory at any depth
+    and, for one in ten, names with wildcards.
+    """
+    lines = []
+    for i in range(n_rules):
+        if i % 100 == 0 and entries:
+            partial_path = entries[(i // 100) % len(entries)][1]
+            rule = partial_path + "*" if glob else partial_path
+        elif not glob:
+            rule = f"missing/path_{i}"
+        elif i % 10 in (1, 2):
+            rule = f"missing_name_{i}"
+        elif i % 10 in (3, 4):
+            rule = f"*.ext_{i}"
+        elif i % 10 == 5:
+            rule = f"/missing/path_{i}"
+        elif i % 10 == 6:
+            rule = f"missing/dir_{i}/**"
+        elif i % 10 in (7, 8):
+            rule = f"**/missing_{i}/*.py"
+        else:
+            rule = f"missing_*_{i}.log"
+        lines.append(rule + "\n")
+    return lines
+
+
+def _setup_is_ignored_sweep(
+    n_rules: int, glob: bool
+) -> Callable[[pathlib.Path], Tuple[IgnoreRules, List[Tuple]]]:
+    """Makes the setup of a sweep case, whose rules replace those of the project,
+    the glob ones as the lines of a .gitignore file
+    """
+
+    def setup(root: pathlib.Path) -> Tuple[IgnoreRules, List[Tuple]]:
+        entries = _list_entries(root)
+        lines = _sweep_rules(entries, n_rules, glob)
+        if glob:
+            rules = IgnoreRules([], [], [], "README.md", lines)
+        else:
+            rules = IgnoreRules(lines, [], [], "README.md")
+        return rules, entries
+
+    return setup
+
+
+def _is_ignored(root: pathlib.Path, state: Tuple[IgnoreRules, List[Tuple]]) -> None:
+    """Checks every entry of the project against the ignore rules"""
+    for entry in state[1]:
+        state[0].is_ignored(*entry)
+
+
+def _setup_render(root: pathlib.Path) -> List[DirectoryParser]:
+    """Loads a tree and parses its files, for only the rendering to be timed"""
+    parser = _load_tree(root)
+    _parse(_py_files(parser))
+    return list(_iter_nodes(parser))
+
+
+def method_cases() -> List[Case]:
+    """Lists the cases of the parser methods, run in the benchmarks process"""
+    return [
+        Case(
+            "DirectoryParser tree walk",
+            lambda root: None,
+            lambda root, _: _load_tree(root),
+        ),
+        Case("IgnoreRules.is_ignored", _setup_is_ignored, _is_ignored),
+        Case(
+            "PackedDocStore load",
+            lambda root: MakedocPaths(root),
+            lambda root, paths: paths.packed_doc_store.get(""),
+        ),
+        Case(
+            "PyscriptParser.get_parsed_doc (cold parse cache)",
+            _setup_cold_parse,
+            lambda root, files: _parse(files),
+        ),
+        Case(
+            "PyscriptParser.get_parsed_doc (warm parse cache)",
+            _setup_warm_parse,
+            lambda root, files: _parse(files),
+        ),
+        Case(
+            "docstring search (content_txt_lines)",
+            lambda root: _py_files(_load_tree(root)),
+            lambda root, files: _find_docstrings(files),
+        ),
+        Case(
+            "docstring search (iter_content_txt_lines)",
+            lambda root: _py_files(_load_tree(root)),
+            lambda root, files: _find_docstrings_bounded(files),
+        ),
+        Case(
+            "DirectoryParser.file_arborescence_repr",
+            _load_tree,
+            lambda root, parser: parser.file_arborescence_repr,
+        ),
+        Case(
+            "DirectoryParser.get_doc_file_content",
+            _setup_render,
+            lambda root, nodes: [node.get_doc_file_content() for node in nodes],
+        ),
+    ]
+
+
+def sweep_cases() -> List[Case]:
+    """Lists the cases of is_ignored with growing numbers of literal and glob rules"""
+    return [
+        Case(
+            f"IgnoreRules.is_ignored ({n_rules} {kind} rules)",
+            _setup_is_ignored_sweep(n_rules, kind == "glob"),
+            _is_ignored,
+        )
+        for kind in ("literal", "glob")
+        for n_rules in IGNORE_RULES_SWEEP
+    ]
+
+
+def time_case(case: Case, root: pathlib.Path, repeat: int) -> Dict[str, Any]:
+    """Runs a case repeatedly and sums up its timings"""
+    times = []
+    output = None
+    for _ in range(repeat):
+        state = case.setup(root)
+        start = perf_counter()
+        output = case.run(root, state)
+        times.append(perf_counter() - start)
+    result: Dict[str, Any] = {
+        "times": times,
+        "min": min(times),
+        "median": statistics.median(times),
+        "mean": statistics.mean(times),
+    }
+    if case.counted:
+        result["counts"] = output
+    return result
+
+
+def _git(*args: str) -> Optional[str]:
+    """Runs a git command in the repository, None if it fails"""
+    try:
+        return subprocess.run(
+            ["git", *args], cwd=REPO_ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def environment() -> Dict[str, Any]:
+    """Describes the commit and the machine the benchmarks are run on"""
+    return {
+        "commit": _git("rev-parse", "HEAD"),
+        "dirty": bool(_git("status", "--porcelain", "--untracked-files=no")),
+        "date": datetime.now().isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "processor": platform.processor(),
+        "cpu-count": os.cpu_count(),
+    }
+
+
+def run_shape(
+    name: str,
+    shape: ProjectShape,
+    work_dir: pathlib.Path,
+    repeat: int,
+    cases: List[Case],
+) -> Dict[str, Any]:
+    """Generates the project of a shape and runs cases on it"""
+    root = work_dir / name
+    _remove(root)
+    start = perf_counter()
+    generate_project(root, shape)
+    generation_seconds = perf_counter() - start
+    n_directories, n_files = count_entries(shape)
+    click.echo(
+        f"{name}: {n_directories} directories, {n_files} files"
+        f" (generated in {generation_seconds:.1f}s)",
+        err=True,
+    )
+
+    results = {}
+    with open(os.devnull, "w") as devnull:
+        for case in cases:
+            # The messages of the parsers run in this process are not printed
+            with contextlib.redirect_stdout(devnull):
+                results[case.name] = time_case(case, root, repeat)
+                gc.collect()
+            median = results[case.name]["median"]
+            counts = "".join(
+                f"  {name} {count}"
+                for name, count in results[case.name].get("counts", {}).items()
+            )
+            click.echo(f"  {case.name:<52}{median:>10.4f}s{counts}", err=True)
+    return {
+        "shape": shape._asdict(),
+        "directories": n_directories,
+        "files": n_files,
+        "results": results,
+    }
+
+
+@click.group()
+def benchmarks():
+    """Benchmarks makedoc on synthetic projects"""
+    pass
+
+
+@benchmarks.command("run")
+@click.option(
+    "-s",
+    "--shape",
+    "shapes",
+    multiple=True,
+    type=click.Choice(sorted(SHAPES)),
+    help=f"The shapes of the projects, by default {', '.join(DEFAULT_SHAPES)}",
+)
+@click.option("-n", "--repeat", default=3, help="The number of runs of each case")
+@click.option("-j", "--jobs", default=1, help="The number of processes of the commands")
+@click.option(
+    "-o",
+    "--output",
+    type=click.Path(dir_okay=False),
+    default=None,
+    help="The results file, by default in benchmarks/results/",
+)
+@click.option(
+    "-w",
+    "--work-dir",
+    type=click.Path(file_okay=False),
+    default=None,
+    help="Where the projects are generated and kept, by default a temporary one",
+)
+@click.option(
+    "--ignore-rules-sweep/--no-ignore-rules-sweep",
+    default=False,
+    help="Whether is_ignored is also timed with growing numbers of rules",
+)
+def run(shapes, repeat, jobs, output, work_dir, ignore_rules_sweep):
+    """Runs the benchmarks and writes their results as JSON"""
+    report = {
+        "environment": environment(),
+        "repeat": repeat,
+        "jobs": jobs,
+        "shapes": {},
+    }
+    with tempfile.TemporaryDirectory(prefix="makedoc-benchmarks-") as temp_dir:
+        work_path = pathlib.Path(work_dir or temp_dir).resolve()
+        work_path.mkdir(parents=True, exist_ok=True)
+        for name in shapes or DEFAULT_SHAPES:
+            report["shapes"][name] = run_shape(
+                name,
+                SHAPES[name],
+                work_path,
+                repeat,
+                command_cases(jobs) + method_cases(),
+            )
+        if ignore_rules_sweep:
+            report["shapes"]["ignore-rules-sweep"] = run_shape(
+                "ignore-rules-sweep",
+                IGNORE_RULES_SWEEP_SHAPE,
+                work_path,
+                repeat,
+                sweep_cases(),
+            )
+
+    if output is None:
+        RESULTS.mkdir(parents=True, exist_ok=True)
+        commit = (report["environment"]["commit"] or "unknown")[:7]
+        date = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
+        output = RESULTS / f"{date}_{commit}.json"
+    with open(output, "w") as f:
+        json.dump(report, f, indent=4, separators=(",", ": "), sort_keys=True)
+    click.echo(f"Results written to {output}", err=True)
+
+
+@benchmarks.command("compare")
+@click.argument("base", type=click.Path(exists=True, dir_okay=False))
+@click.argument("new", type=click.Path(exists=True, dir_okay=False))
+def compare(base, new):
+    """Compares the median timings of two results files"""
+    with open(base, "r") as f:
+        base_report = json.load(f)
+    with open(new, "r") as f:
+        new_report = json.load(f)
+    for name, new_shape in new_report["shapes"].items():
+        base_shape = base_report["shapes"].get(name)
+        if base_shape is None:
+            continue
+        print(name)
+        for case, new_result in new_shape["results"].items():
+            if case not in base_shape["results"]:
+                continue
+            base_median = base_shape["results"][case]["median"]
+            new_median = new_result["median"]
+            print(
+                f"  {case:<52}{base_median:>10.4f}s{new_median:>10.4f}s"
+                f"{new_median / base_median if base_median else 0.0:>8.2f}x"
+            )
+
+
+if __name__ == "__main__":
+    benchmarks()
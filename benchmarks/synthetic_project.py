@@ -0,0 +1,187 @@
+"""Generates synthetic makedoc projects of configurable shape for the benchmarks"""
+
+import json
+import os
+import pathlib
+import random
+import time
+from typing import Dict, List, NamedTuple, Tuple
+
+# The rules makedoc init writes by default, kept so that the generated projects
+# behave like real ones
+DEFAULT_IGNORED_PATHS = [".git", ".idea", ".makedoc", ".venv", ".vscode", "tmp"]
+DEFAULT_IGNORE_EVERY = ["README.md", "__pycache__", ".pytest_cache"]
+DEFAULT_IGNORED_EXTENSIONS = ["pdf", "txt"]
+
+# The extensions of the files that are not python scripts
+OTHER_EXTENSIONS = ["md", "json", "txt", "cfg"]
+
+# The files are dated back, so that the parse cache does not consider them as
+# possibly still being modified
+FILES_AGE_SECONDS = 3600
+
+
+class ProjectShape(NamedTuple):
+    """The shape of a synthetic project
+
+    Attributes:
+        width (int)
+            The number of sub directories of each directory
+        depth (int)
+            The number of directory levels below the root
+        files_per_dir (int)
+            The number of files of each directory
+        py_ratio (float)
+            The proportion of python files, the others being of OTHER_EXTENSIONS
+        docstring_lines (int)
+            The number of lines of the docstrings of the python files
+        code_lines (int)
+            The number of lines of code following the docstrings
+        ignore_rules (int)
+            The number of rules added to each of the three ignore files. One in a
+            hundred matches an entry of the project.
+        dirdoc_chars (int)
+            The number of characters of the doc of each directory in
+            packed_doc.json
+    """
+
+    width: int
+    depth: int
+    files_per_dir: int
+    py_ratio: float = 0.8
+    docstring_lines: int = 5
+    code_lines: int = 40
+    ignore_rules: int = 0
+    dirdoc_chars: int = 200
+
+
+SHAPES: Dict[str, ProjectShape] = {
+    "wide": ProjectShape(width=300, depth=1, files_per_dir=30),
+    "deep": ProjectShape(width=1, depth=100, files_per_dir=10),
+    "deep-50k-files": ProjectShape(width=1, depth=30, files_per_dir=1613),
+    "ignore-rules": ProjectShape(width=6, depth=3, files_per_dir=20, ignore_rules=5000),
+    "large-files": ProjectShape(
+        width=4, depth=2, files_per_dir=20, docstring_lines=200, code_lines=20000
+    ),
+    "packed-doc": ProjectShape(width=8, depth=3, files_per_dir=5, dirdoc_chars=50000),
+    "50k-files": ProjectShape(width=22, depth=2, files_per_dir=98),
+    "100k-entries": ProjectShape(width=10, depth=3, files_per_dir=89),
+}
+
+# The shapes run when none is given, the others being too long for a quick run
+DEFAULT_SHAPES = [
+    "wide",
+    "deep",
+    "deep-50k-files",
+    "ignore-rules",
+    "large-files",
+    "packed-doc",
+]
+
+
+def _iter_directories(shape: ProjectShape) -> List[Tuple[str, ...]]:
+    """Lists the relative paths of the directories of the project, as parts"""
+    directories: List[Tuple[str, ...]] = [()]
+    level = [()]
+    for _ in range(shape.depth):
+        level = [parent + (f"dir_{i}",) for parent in level for i in range(shape.width)]
+        directories += level
+    return directories
+
+
+def _py_file_content(shape: ProjectShape, rng: random.Random, name: str) -> str:
+    """Builds the content of a python file, one in ten having no docstring"""
+    lines = []
+    if rng.random() >= 0.1:
+        lines.append(f'"""{name}')
+        lines += [
+            f"Line {i} of the docstring of {name}"
+            for i in range(shape.docstring_lines - 1)
+        ]
+        lines.append('"""')
+    lines.append("")
+    lines += [f"value_{i} = {i} * {i}" for i in range(shape.code_lines)]
+    return "\n".join(lines) + "\n"
+
+
+def _ignore_rules(
+    shape: ProjectShape, directories: List[Tuple[str, ...]]
+) -> Tuple[List[str], List[str], List[str]]:
+    """Builds the rules of the ignore files, the few matching ones being spread
+    evenly over the project
+    """
+    paths = list(DEFAULT_IGNORED_PATHS)
+    names = list(DEFAULT_IGNORE_EVERY)
+    extensions = list(DEFAULT_IGNORED_EXTENSIONS)
+    for i in range(shape.ignore_rules):
+        matches = i % 100 == 0
+        if matches and len(directories) > 1:
+            directory = directories[1 + (i // 100) % (len(directories) - 1)]
+            paths.append("/".join(directory + ("file_0.py",)))
+        else:
+            paths.append(f"missing/path_{i}")
+        names.append("file_1.md" if matches and i == 0 else f"missing_name_{i}")
+        extensions.append(f"ext{i}")
+    return paths, names, extensions
+
+
+def generate_project(root: pathlib.Path, shape: ProjectShape, seed: int = 0) -> None:
+    """Writes a synthetic makedoc project
+
+    The project is given a packed_doc.json and the three ignore files, the other
+    config files being left to makedoc init.
+
+    Args:
+        root: pathlib.Path
+            The directory of the project, created if needed
+        shape: ProjectShape
+            The shape of the project
+        seed: int
+            The seed of the random choices, for the projects to be reproducible
+    """
+    rng = random.Random(seed)
+    directories = _iter_directories(shape)
+    written: List[pathlib.Path] = []
+    for directory in directories:
+        path = root.joinpath(*directory)
+        path.mkdir(parents=True, exist_ok=True)
+        written.append(path)
+        for i in range(shape.files_per_dir):
+            if rng.random() < shape.py_ratio:
+                name = f"file_{i}.py"
+                content = _py_file_content(shape, rng, name)
+            else:
+                name = f"file_{i}.{rng.choice(OTHER_EXTENSIONS)}"
+                content = f"Content of {name}\n"
+            with open(path / name, "w") as f:
+                f.write(content)
+            written.append(path / name)
+
+    makedoc = root / ".makedoc"
+    (makedoc / "config").mkdir(parents=True, exist_ok=True)
+    packed_doc = {}
+    for directory in directories:
+        title = f"# {directory[-1] if directory else root.name}\n\n"
+        body = "Documentation of the directory. " * (shape.dirdoc_chars // 32 + 1)
+        packed_doc["/".join(directory)] = title + body[: shape.dirdoc_chars]
+    with open(makedoc / "packed_doc.json", "w") as f:
+        json.dump(packed_doc, f, indent=4, separators=(",", ": "), sort_keys=True)
+
+    paths, names, extensions = _ignore_rules(shape, directories)
+    for file_name, rules in (
+        ("makedoc.ignored_paths", paths),
+        ("makedoc.ignore_every", names),
+        ("makedoc.ignored_extensions", extensions),
+    ):
+        with open(makedoc / "config" / file_name, "w") as f:
+            f.write("".join(rule + "\n" for rule in rules))
+
+    date = time.time() - FILES_AGE_SECONDS
+    for path in written:
+        os.utime(path, (date, date))
+
+
+def count_entries(shape: ProjectShape) -> Tuple[int, int]:
+    """Gets the number of directories and files of a project"""
+    n_directories = len(_iter_directories(shape))
+    return n_directories, n_directories * shape.files_per_dir
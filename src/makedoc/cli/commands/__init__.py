@@ -1,7 +1,3 @@
-from .check import check
-from .config import config
-from .generate import generate
-from .init import init
-from .pack import pack
-from .unpack import unpack
-from .update import update
+"""The commands of the cli, one per module. The modules are imported by the cli
+group when their command is used, so they are not imported here.
+"""
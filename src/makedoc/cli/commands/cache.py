@@ -0,0 +1,34 @@
+"""Implements a cache command to makedoc cli"""
+import click
+
+
+@click.group("cache")
+def cache():
+    """Manages the cache of the parsed python files"""
+    pass
+
+
+@cache.command("clear")
+@click.argument("root_dir", type=click.Path(), required=False)
+@click.pass_context
+def clear(ctx, root_dir):
+    """Removes the cache"""
+    ctx.obj.project.resolve_makedoc_paths(root_dir).parse_cache.clear()
+
+
+@cache.command("stats")
+@click.argument("root_dir", type=click.Path(), required=False)
+@click.pass_context
+def stats(ctx, root_dir):
+    """Prints the size and the efficiency of the cache"""
+    parse_cache = ctx.obj.project.resolve_makedoc_paths(root_dir).parse_cache
+    cache_stats = parse_cache.stats()
+    n_lookups = cache_stats["hits"] + cache_stats["misses"]
+    hit_rate = cache_stats["hits"] / n_lookups if n_lookups else 0.0
+    print(f"Location:  {parse_cache.db_path}")
+    print(f"Enabled:   {parse_cache.enabled}")
+    print(f"Entries:   {cache_stats['entries']}")
+    print(f"Size:      {cache_stats['bytes']} / {parse_cache.max_bytes} bytes")
+    print(f"File size: {cache_stats['file-size']} bytes")
+    print(f"Hits:      {cache_stats['hits']} ({hit_rate:.1%})")
+    print(f"Misses:    {cache_stats['misses']}")
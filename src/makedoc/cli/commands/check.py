@@ -1,10 +1,5 @@
-import os
-import pathlib
-
 import click
 
-from makedoc.parsers.directory_parser import DirectoryParser
-
 
 @click.command("check")
 @click.option(
@@ -20,6 +15,28 @@ from makedoc.parsers.directory_parser import DirectoryParser
     is_flag=True,
     help="Recursively apply the command to all non-ignored subdirs",
 )
+@click.option(
+    "-j",
+    "--jobs",
+    "jobs",
+    type=click.IntRange(min=1),
+    default=1,
+    help="Number of processes used to parse independent subtrees",
+)
+@click.option(
+    "--since",
+    "since",
+    metavar="REF",
+    default=None,
+    help="Only processes what changed since a git revision, implies -r",
+)
+@click.option(
+    "--files-from",
+    "files_from",
+    type=click.File("r"),
+    default=None,
+    help="Only processes the paths listed in a file, - for stdin, implies -r",
+)
 @click.argument("root_dir", type=click.Path(), required=False)
 @click.pass_context
 def check(ctx, *args, **kwargs):
@@ -33,26 +50,14 @@ def check(ctx, *args, **kwargs):
     if args.pop("verbose"):
         print("Updating doc")
 
-    root_dir_str = args.pop("root_dir")
-    if root_dir_str is None:
-        root_dir_str = "."
-    pth = pathlib.Path(root_dir_str).resolve().absolute()
-    root = None
-    while pth:
-        if ".makedoc" in os.listdir(pth):
-            root = pth
-            break
-        else:
-            pth = pth.parent
-    if root is None:
-        raise ValueError(
-            "The provided path is does not seem to be in a makedoc project"
-        )
-    else:
-        parser = DirectoryParser(
-            path=pathlib.Path(root_dir_str).resolve().absolute(), root_path=root
-        )
-
-        recurse = args.pop("recurse")
-
-        parser.check_parsing(recurse=recurse)
+    project = ctx.obj.project
+    parser = project.directory_parser(args.pop("root_dir"))
+    changed_paths = project.changed_paths(
+        parser.path, args.pop("since"), args.pop("files_from")
+    )
+
+    recurse = args.pop("recurse")
+
+    parser.run_pipeline(
+        ["check"], recurse=recurse, jobs=args.pop("jobs"), changed_paths=changed_paths
+    )
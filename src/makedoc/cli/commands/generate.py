@@ -1,10 +1,7 @@
-import os
 import pathlib
 
 import click
 
-from makedoc.parsers.source_directory_parser import DirectoryParser
-
 
 @click.command("generate")
 @click.option(
@@ -21,6 +18,14 @@ from makedoc.parsers.source_directory_parser import DirectoryParser
     help="The output file path for the doc. If not provided, the default file name is "
     "chosen.",
 )
+@click.option(
+    "-j",
+    "--jobs",
+    "jobs",
+    type=click.IntRange(min=1),
+    default=1,
+    help="Number of processes used to parse independent subtrees",
+)
 @click.argument("root_dir", type=click.Path(), required=False)
 @click.pass_context
 def generate(ctx, *args, **kwargs):
@@ -34,27 +39,12 @@ def generate(ctx, *args, **kwargs):
     if args.pop("verbose"):
         print("Generating a doc file")
 
-    root_dir_str = args.pop("root_dir")
-    if root_dir_str is None:
-        root_dir_str = "."
-    pth = pathlib.Path(root_dir_str).resolve().absolute()
-    root = None
-    while pth:
-        if ".makedoc" in os.listdir(pth):
-            root = pth
-            break
-        else:
-            pth = pth.parent
-    if root is None:
-        raise ValueError(
-            "The provided path is does not seem to be in a makedoc project"
-        )
+    parser = ctx.obj.project.directory_parser(args.pop("root_dir"))
+    output_path = args.pop("output_path")
+    jobs = args.pop("jobs")
+    if output_path is None:
+        parser.save_readme(jobs=jobs)
     else:
-        parser = DirectoryParser(
-            path=pathlib.Path(root_dir_str).resolve().absolute(), root_path=root
+        parser.save_readme(
+            save_path=pathlib.Path(output_path).resolve().absolute(), jobs=jobs
         )
-        output_path = args.pop("output_path")
-        if output_path is None:
-            parser.save_readme()
-        else:
-            parser.save_readme(save_path=pathlib.Path(output_path).resolve().absolute())
@@ -29,4 +29,6 @@ def init(ctx, *args, **kwargs):
     if root_dir_str is None:
         root_dir_str = "."
     pth = pathlib.Path(root_dir_str).resolve().absolute()
-    _ = SourceDirectoryParser(path=pth)
+    _ = SourceDirectoryParser(
+        path=pth, tree_listing=ctx.obj.project.tree_listing(pth, pth)
+    )
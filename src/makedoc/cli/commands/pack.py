@@ -1,10 +1,5 @@
-import os
-import pathlib
-
 import click
 
-from makedoc.parsers.directory_parser import DirectoryParser
-
 
 @click.command("pack")
 @click.option(
@@ -28,6 +23,20 @@ from makedoc.parsers.directory_parser import DirectoryParser
     is_flag=True,
     help="Combines -r and -u in one single flag",
 )
+@click.option(
+    "--since",
+    "since",
+    metavar="REF",
+    default=None,
+    help="Only processes what changed since a git revision, implies -r",
+)
+@click.option(
+    "--files-from",
+    "files_from",
+    type=click.File("r"),
+    default=None,
+    help="Only processes the paths listed in a file, - for stdin, implies -r",
+)
 @click.argument("root_dir", type=click.Path(), required=False)
 @click.pass_context
 def pack(ctx, *args, **kwargs):
@@ -41,32 +50,24 @@ def pack(ctx, *args, **kwargs):
     if args.pop("verbose"):
         print("Repacking the directory doc")
 
-    root_dir_str = args.pop("root_dir")
-    if root_dir_str is None:
-        root_dir_str = "."
-    pth = pathlib.Path(root_dir_str).resolve().absolute()
-    root = None
-    while pth:
-        if ".makedoc" in os.listdir(pth):
-            root = pth
-            break
-        else:
-            pth = pth.parent
-    if root is None:
-        raise ValueError(
-            "The provided path is does not seem to be in a makedoc project"
-        )
-    else:
-        parser = DirectoryParser(
-            path=pathlib.Path(root_dir_str).resolve().absolute(), root_path=root
-        )
-        recurse = args.pop("recurse")
-        update = args.pop("update")
-        recurse_update = args.pop("recurse_update")
+    project = ctx.obj.project
+    parser = project.directory_parser(args.pop("root_dir"))
+    changed_paths = project.changed_paths(
+        parser.path, args.pop("since"), args.pop("files_from")
+    )
+    recurse = args.pop("recurse")
+    update = args.pop("update")
+    recurse_update = args.pop("recurse_update")
 
-        recurse = recurse or recurse_update
-        update = update or recurse_update
+    recurse = recurse or recurse_update
+    update = update or recurse_update
 
+    if update:
+        # Updating after the pack costs no extra traversal of the tree
+        parser.run_pipeline(
+            ["pack", "update"], recurse=recurse, changed_paths=changed_paths
+        )
+    elif changed_paths is not None:
+        parser.run_pipeline(["pack"], changed_paths=changed_paths)
+    else:
         parser.pack_doc(recurse=recurse)
-        if update:
-            parser.update_doc(recurse=recurse)
@@ -0,0 +1,48 @@
+"""Implements a packed-doc command to makedoc cli"""
+
+import pathlib
+
+import click
+
+from makedoc.packed_doc_store import dump_packed_doc, load_packed_doc
+
+
+@click.group("packed-doc")
+def packed_doc():
+    """Converts the packed directory docs from and to the json format"""
+    pass
+
+
+@packed_doc.command("export")
+@click.option(
+    "-o",
+    "--output",
+    type=click.Path(dir_okay=False),
+    default=None,
+    help="The json file to write, .makedoc/packed_doc.json by default",
+)
+@click.argument("root_dir", type=click.Path(), required=False)
+@click.pass_context
+def export(ctx, output, root_dir):
+    """Writes the packed docs of the configured backend to a json file"""
+    makedoc_paths = ctx.obj.project.resolve_makedoc_paths(root_dir)
+    output_path = makedoc_paths.packed_doc if output is None else pathlib.Path(output)
+    dump_packed_doc(makedoc_paths.packed_doc_store.read_all(), output_path)
+
+
+@packed_doc.command("import")
+@click.option(
+    "-i",
+    "--input",
+    "input_",
+    type=click.Path(dir_okay=False, exists=True),
+    default=None,
+    help="The json file to read, .makedoc/packed_doc.json by default",
+)
+@click.argument("root_dir", type=click.Path(), required=False)
+@click.pass_context
+def import_(ctx, input_, root_dir):
+    """Replaces the packed docs of the configured backend with a json file"""
+    makedoc_paths = ctx.obj.project.resolve_makedoc_paths(root_dir)
+    input_path = makedoc_paths.packed_doc if input_ is None else pathlib.Path(input_)
+    makedoc_paths.packed_doc_store.replace_all(load_packed_doc(input_path))
@@ -1,8 +1,4 @@
 import click
-import pathlib
-
-from makedoc.parsers.directory_parser import DirectoryParser
-import os
 
 
 @click.command("unpack")
@@ -31,23 +27,5 @@ def unpack(ctx, *args, **kwargs):
     if args.pop("verbose"):
         print("Unppacking the directory doc")
 
-    root_dir_str = args.pop("root_dir")
-    if root_dir_str is None:
-        root_dir_str = "."
-    pth = pathlib.Path(root_dir_str).resolve().absolute()
-    root = None
-    while pth:
-        if ".makedoc" in os.listdir(pth):
-            root = pth
-            break
-        else:
-            pth = pth.parent
-    if root is None:
-        raise ValueError(
-            "The provided path is does not seem to be in a makedoc project"
-        )
-    else:
-        parser = DirectoryParser(
-            path=pathlib.Path(root_dir_str).resolve().absolute(), root_path=root
-        )
-        parser.unpack_doc(recurse=args.pop("recurse"))
+    parser = ctx.obj.project.directory_parser(args.pop("root_dir"))
+    parser.unpack_doc(recurse=args.pop("recurse"))
@@ -0,0 +1,100 @@
+import os
+import pathlib
+from typing import Tuple
+
+import click
+
+from makedoc.cli.project_context import ProjectContext
+from makedoc.fs_watchers import WatcherAbstract, get_watcher
+from makedoc.parsers.incremental_updater import IncrementalUpdater
+
+
+def _start(
+    project: ProjectContext,
+    path: pathlib.Path,
+    root: pathlib.Path,
+    polling: bool,
+    interval: float,
+) -> Tuple[IncrementalUpdater, WatcherAbstract]:
+    """Builds the tree, starts watching it and brings its doc md files up to date"""
+    parser = project.directory_parser(str(path))
+    updater = IncrementalUpdater(parser)
+    watcher = get_watcher(polling=polling, interval=interval)
+    # The watches are set before the update, so that no change is missed
+    for directory in updater.iter_directories():
+        watcher.add_directory(str(directory.path))
+    watcher.add_directory(str(parser.makedoc_paths.packed_doc.parent))
+    watcher.add_directory(str(parser.makedoc_paths.config))
+    if updater.git_index_path is not None:
+        watcher.add_directory(os.path.dirname(updater.git_index_path))
+    parser.update_doc(recurse=True)
+    return updater, watcher
+
+
+@click.command("watch")
+@click.option(
+    "-v",
+    "verbose",
+    is_flag=True,
+    help="Sets verbosity",
+)
+@click.option(
+    "-d",
+    "--debounce",
+    "debounce",
+    type=click.FloatRange(min=0),
+    default=0.2,
+    help="Seconds without change to wait for before updating the doc",
+)
+@click.option(
+    "--polling",
+    "polling",
+    is_flag=True,
+    help="Lists the directories periodically instead of using inotify",
+)
+@click.option(
+    "-i",
+    "--interval",
+    "interval",
+    type=click.FloatRange(min=0, min_open=True),
+    default=1.0,
+    help="Seconds between two listings when polling",
+)
+@click.argument("root_dir", type=click.Path(), required=False)
+@click.pass_context
+def watch(ctx, *args, **kwargs):
+    """Keeps the doc md files up to date while the files change"""
+
+    for key, value in kwargs.items():
+        ctx.obj.set_config(key, value)
+
+    args = ctx.obj.config
+
+    verbose = args.pop("verbose")
+
+    project = ctx.obj.project
+    path, root = project.resolve(args.pop("root_dir"))
+    debounce = args.pop("debounce")
+    polling = args.pop("polling")
+    interval = args.pop("interval")
+
+    updater, watcher = _start(project, path, root, polling, interval)
+    if verbose:
+        print(f"Watching {path}")
+    try:
+        while True:
+            changes = watcher.read_debounced_changes(debounce)
+            if not watcher.overflowed and not updater.needs_reload:
+                new_directories = updater.apply_changes(changes)
+                for new_directory in new_directories:
+                    for directory in updater.iter_directories(new_directory):
+                        watcher.add_directory(str(directory.path))
+            if watcher.overflowed or updater.needs_reload:
+                watcher.close()
+                # The config and the packed doc are read again
+                project.forget(root)
+                updater, watcher = _start(project, path, root, polling, interval)
+                if verbose:
+                    print("Reloaded the whole tree")
+    except KeyboardInterrupt:
+        watcher.close()
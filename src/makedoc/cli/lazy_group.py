@@ -0,0 +1,58 @@
+"""Implements a click group that imports its subcommands on demand"""
+
+import importlib
+from typing import Dict, List, Optional, Tuple
+
+import click
+
+
+class LazyGroup(click.Group):
+    """A click group that imports the module of a subcommand only when the
+    subcommand is used.
+
+    The subcommands are given by their name, the import path of the command,
+    "package.module:attribute", and their short help. The help of the group and
+    the completion of the subcommand names do not import any of them.
+    """
+
+    def __init__(
+        self,
+        *args,
+        lazy_subcommands: Optional[Dict[str, Tuple[str, str]]] = None,
+        **kwargs,
+    ) -> None:
+        super(LazyGroup, self).__init__(*args, **kwargs)
+        self.lazy_subcommands: Dict[str, Tuple[str, str]] = lazy_subcommands or {}
+
+    def list_commands(self, ctx: click.Context) -> List[str]:
+        """Lists the names of the subcommands, imported or not"""
+        return sorted(
+            set(super(LazyGroup, self).list_commands(ctx)) | set(self.lazy_subcommands)
+        )
+
+    def get_command(self, ctx: click.Context, cmd_name: str) -> Optional[click.Command]:
+        """Gets a subcommand, importing its module if needed"""
+        if cmd_name in self.lazy_subcommands and cmd_name not in self.commands:
+            import_path, _ = self.lazy_subcommands[cmd_name]
+            module_name, attribute = import_path.split(":")
+            module = importlib.import_module(module_name)
+            self.add_command(getattr(module, attribute), cmd_name)
+        return super(LazyGroup, self).get_command(ctx, cmd_name)
+
+    def format_commands(
+        self, ctx: click.Context, formatter: click.HelpFormatter
+    ) -> None:
+        """Writes the subcommands and their short help, without importing them"""
+        names = self.list_commands(ctx)
+        if not names:
+            return
+        limit = formatter.width - 6 - max(len(name) for name in names)
+        rows = []
+        for name in names:
+            command = self.commands.get(name)
+            if command is None:
+                rows.append((name, self.lazy_subcommands[name][1]))
+            elif not command.hidden:
+                rows.append((name, command.get_short_help_str(limit)))
+        with formatter.section("Commands"):
+            formatter.write_dl(rows)
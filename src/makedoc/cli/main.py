@@ -1,46 +1,102 @@
 """This file implements a command line interface for launching generators"""
 
+import pathlib
+
 import click
 
 from makedoc import __VERSION__
-from makedoc.cli.commands.pack import pack
-from makedoc.cli.commands.unpack import unpack
-from makedoc.cli.commands.update import update
+from makedoc.cli.lazy_group import LazyGroup
 
-from .commands import check, config, generate, init
+# The subcommands, their command and their short help. Their modules are only
+# imported when they are used, for the help and the completion to be fast.
+COMMANDS = {
+    "cache": (
+        "makedoc.cli.commands.cache:cache",
+        "Manages the cache of the parsed python files",
+    ),
+    "check": (
+        "makedoc.cli.commands.check:check",
+        "Checks the parsing without touching files",
+    ),
+    "config": ("makedoc.cli.commands.config:config", "Gets config utilities"),
+    "generate": ("makedoc.cli.commands.generate:generate", "Generates a doc file"),
+    "init": (
+        "makedoc.cli.commands.init:init",
+        "initialise the makedoc profile for the directory",
+    ),
+    "pack": ("makedoc.cli.commands.pack:pack", "Repacks the directory doc"),
+    "packed-doc": (
+        "makedoc.cli.commands.packed_doc:packed_doc",
+        "Converts the packed directory docs from and to the json format",
+    ),
+    "unpack": ("makedoc.cli.commands.unpack:unpack", "Unpacks the directory doc"),
+    "update": ("makedoc.cli.commands.update:update", "Updates the doc md files"),
+    "watch": (
+        "makedoc.cli.commands.watch:watch",
+        "Keeps the doc md files up to date while the files change",
+    ),
+}
 
 
 class Config(object):
-    """An object designed to conatin and pass the config"""
+    """An object designed to conatin and pass the config, along with the
+    context of the makedoc projects the commands apply to
+    """
 
     def __init__(self) -> None:
         self.config = {}
+        self._project = None
+
+    @property
+    def project(self):
+        """Gets the project context, imported with the parsers on first use"""
+        if self._project is None:
+            from makedoc.cli.project_context import ProjectContext
+
+            self._project = ProjectContext()
+        return self._project
 
     def set_config(self, key, value):
         """Sets a key-value pair into the config"""
         self.config[key] = value
 
 
-@click.group()
+@click.group(cls=LazyGroup, lazy_subcommands=COMMANDS)
 @click.version_option(version=__VERSION__)
+@click.option(
+    "--profile",
+    is_flag=True,
+    help="Prints a report of where the time of the run went",
+)
+@click.option(
+    "--profile-output",
+    type=click.Path(dir_okay=False),
+    default=None,
+    help="Also dumps cProfile statistics of the run to this file",
+)
 @click.pass_context
-def cli(ctx, *args, **kwargs):
+def cli(ctx, profile, profile_output, *args, **kwargs):
     """
     Loads all high level kwargs into the config.
     For supporting autocompletion, please run:
 
     source autocomplete-makedoc
     """
-    ctx.obj = Config()
+    # A Config given by a script invoking several commands is kept
+    ctx.ensure_object(Config)
+    if profile or profile_output is not None:
+        from makedoc.logging.profiling import RunProfile
+
+        run_profile = RunProfile(
+            pathlib.Path(profile_output) if profile_output is not None else None
+        )
+        run_profile.start()
+
+        def report_profile():
+            run_profile.stop()
+            click.echo(run_profile.report(), err=True)
+
+        ctx.call_on_close(report_profile)
     for key, value in kwargs.items():
         ctx.obj.set_config(key, value)
         print(key, type(value), value)
-
-
-cli.add_command(check)
-cli.add_command(config)
-cli.add_command(generate)
-cli.add_command(init)
-cli.add_command(pack)
-cli.add_command(unpack)
-cli.add_command(update)
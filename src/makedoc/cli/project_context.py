@@ -0,0 +1,116 @@
+"""Implements the makedoc project context shared by the cli commands"""
+
+import os
+import pathlib
+from typing import Dict, List, Optional, TextIO, Tuple
+
+from makedoc import git
+from makedoc.makedoc_paths import MakedocPaths
+from makedoc.parsers.directory_parser import DirectoryParser
+from makedoc.parsers.tree_listing import TreeListing
+
+
+class ProjectContext(object):
+    """Finds the makedoc projects the commands apply to and keeps their paths.
+
+    The roots found and the MakedocPaths objects, which hold the config, the
+    ignore rules and the packed doc once read, are kept for the whole run, so
+    that chained or scripted invocations do not set them up again.
+    """
+
+    def __init__(self) -> None:
+        self._roots: Dict[pathlib.Path, pathlib.Path] = {}
+        self._makedoc_paths: Dict[pathlib.Path, MakedocPaths] = {}
+
+    def find_root(self, path: pathlib.Path) -> pathlib.Path:
+        """Finds the root of the project that contains a directory
+
+        The ancestors of the directory are checked for a .makedoc directory with
+        a single stat each, without being listed.
+        """
+        if path not in self._roots:
+            for directory in (path, *path.parents):
+                if os.path.isdir(directory / ".makedoc"):
+                    self._roots[path] = directory
+                    break
+            else:
+                raise ValueError(
+                    "The provided path is does not seem to be in a makedoc project"
+                )
+        return self._roots[path]
+
+    def resolve(self, root_dir_str: Optional[str]) -> Tuple[pathlib.Path, pathlib.Path]:
+        """Gets the absolute path of a command directory argument, and the root
+        of its project
+        """
+        if root_dir_str is None:
+            root_dir_str = "."
+        path = pathlib.Path(root_dir_str).resolve().absolute()
+        return path, self.find_root(path)
+
+    def makedoc_paths(self, root: pathlib.Path) -> MakedocPaths:
+        """Gets the paths of a project, created once"""
+        if root not in self._makedoc_paths:
+            self._makedoc_paths[root] = MakedocPaths(root)
+        return self._makedoc_paths[root]
+
+    def resolve_makedoc_paths(self, root_dir_str: Optional[str]) -> MakedocPaths:
+        """Gets the paths of the project that contains a command directory
+        argument
+        """
+        _, root = self.resolve(root_dir_str)
+        return self.makedoc_paths(root)
+
+    def forget(self, root: pathlib.Path) -> None:
+        """Drops the paths of a project, for its config to be read again"""
+        self._makedoc_paths.pop(root, None)
+
+    def tree_listing(
+        self, path: pathlib.Path, root: pathlib.Path
+    ) -> Optional[TreeListing]:
+        """Lists the tree of a directory from the files git tracks if the "source"
+        of the "tree" config is "git-index". None if the directories are to be
+        listed on the file system, which is the default of a project that has no
+        config yet.
+        """
+        makedoc_paths = self.makedoc_paths(root)
+        if not makedoc_paths.config_json.exists():
+            return None
+        tree_source = makedoc_paths.config_dict.get("tree", {}).get("source")
+        if tree_source == "git-index":
+            return TreeListing.from_git_index(path, root)
+        return None
+
+    def directory_parser(self, root_dir_str: Optional[str]) -> DirectoryParser:
+        """Builds a lazy parser of a command directory argument, from the tree
+        listing of the project if it has one
+        """
+        path, root = self.resolve(root_dir_str)
+        return DirectoryParser(
+            path=path,
+            root_path=root,
+            makedoc_path=self.makedoc_paths(root),
+            lazy=True,
+            tree_listing=self.tree_listing(path, root),
+        )
+
+    @staticmethod
+    def changed_paths(
+        path: pathlib.Path, since: Optional[str], files_from: Optional[TextIO]
+    ) -> Optional[List[str]]:
+        """Gets the paths a command is scoped to: the ones that changed since a
+        git revision, and the ones listed one per line in a file, relative to the
+        working directory. None if the command is not scoped.
+        """
+        if since is None and files_from is None:
+            return None
+        paths = []
+        if since is not None:
+            paths += git.changed_paths(str(path), since)
+        if files_from is not None:
+            paths += [
+                os.path.abspath(line.rstrip("\n"))
+                for line in files_from
+                if line.strip()
+            ]
+        return paths
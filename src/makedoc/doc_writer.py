@@ -0,0 +1,89 @@
+"""Implements the writing of the doc files, which are only touched when needed"""
+
+import contextlib
+import pathlib
+import re
+from datetime import datetime
+from typing import Iterable, Optional, TextIO
+
+from makedoc.utils.atomic_file import write_atomically
+
+# The generation date that ends every doc file
+DATE_FORMAT = " %D %H:%M:%S "
+DATE_PATTERN = re.compile(r" \d\d/\d\d/\d\d \d\d:\d\d:\d\d ")
+
+# The number of characters copied at once from an existing doc file
+COPY_BLOCK_SIZE = 1 << 16
+
+
+def format_date(date: datetime) -> str:
+    """Formats the generation date of a doc file"""
+    return date.strftime(DATE_FORMAT)
+
+
+def write_doc_file(
+    path: pathlib.Path,
+    undated_chunks: Iterable[str],
+    date: str,
+    keep_unchanged_date=True,
+) -> bool:
+    """Streams a doc file content to the file, unless the file already holds it.
+
+    The chunks are compared on the fly with the existing file. On the first
+    difference, the matching beginning of the existing file, the remaining chunks
+    and the date are written to a temporary file that then replaces the existing
+    one. The memory used is thus bounded by the size of a chunk.
+
+    Args:
+        path: pathlib.Path
+            The path of the doc file
+        undated_chunks: Iterable[str]
+            The doc file content, without the generation date that ends it
+        date: str
+            The generation date
+        keep_unchanged_date: bool
+            If set, a file that only differs by its generation date is considered
+            unchanged, so that the date is only refreshed along with the content.
+
+    Returns:
+        bool: whether the file was written
+    """
+    chunks = iter(undated_chunks)
+    try:
+        existing_file: Optional[TextIO] = open(path, "r")
+    except FileNotFoundError:
+        existing_file = None
+
+    with contextlib.ExitStack() as stack:
+        n_matching_chars = 0
+        first_chunk: Optional[str] = None
+        if existing_file is not None:
+            stack.enter_context(existing_file)
+            for chunk in chunks:
+                if existing_file.read(len(chunk)) != chunk:
+                    first_chunk = chunk
+                    break
+                n_matching_chars += len(chunk)
+            else:
+                existing_date = existing_file.read(len(date) + 1)
+                if existing_date == date or (
+                    keep_unchanged_date and DATE_PATTERN.fullmatch(existing_date)
+                ):
+                    return False
+
+        def write(f: TextIO) -> None:
+            if existing_file is not None:
+                existing_file.seek(0)
+                n_chars_left = n_matching_chars
+                while n_chars_left > 0:
+                    block = existing_file.read(min(n_chars_left, COPY_BLOCK_SIZE))
+                    f.write(block)
+                    n_chars_left -= len(block)
+            if first_chunk is not None:
+                f.write(first_chunk)
+            for chunk in chunks:
+                f.write(chunk)
+            f.write(date)
+
+        write_atomically(path, write)
+    return True
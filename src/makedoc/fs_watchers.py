@@ -0,0 +1,202 @@
+"""Implements file system watchers, that report the paths modified in a set of
+watched directories.
+
+InotifyWatcher relies on the Linux inotify API, through ctypes. PollingWatcher is
+the portable fallback: it periodically lists the watched directories.
+"""
+
+import ctypes
+import ctypes.util
+import errno
+import os
+import select
+import struct
+import sys
+import time
+from abc import ABC, abstractmethod
+from typing import Dict, Optional, Set, Tuple
+
+# inotify event masks, see inotify(7)
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_CLOEXEC = 0o2000000
+IN_NONBLOCK = 0o4000
+
+WATCH_MASK = (
+    IN_CLOSE_WRITE
+    | IN_MOVED_FROM
+    | IN_MOVED_TO
+    | IN_CREATE
+    | IN_DELETE
+    | IN_DELETE_SELF
+    | IN_ONLYDIR
+)
+EVENT_HEADER = struct.Struct("iIII")
+
+
+class WatcherAbstract(ABC):
+    """Blueprint class for file system watchers"""
+
+    # Set when events were lost: the watched tree has to be scanned again
+    overflowed: bool = False
+
+    @abstractmethod
+    def add_directory(self, path: str) -> None:
+        """Starts watching the direct content of a directory"""
+
+    @abstractmethod
+    def read_changes(self, timeout: Optional[float]) -> Set[str]:
+        """Waits for changes and returns the modified paths.
+
+        Args:
+            timeout: Optional[float]
+                The number of seconds to wait for a change, None to wait forever
+
+        Returns:
+            Set[str]: the modified paths, empty if the timeout expired
+        """
+
+    def read_debounced_changes(self, debounce: float) -> Set[str]:
+        """Waits for changes, then keeps collecting them until none happens for
+        debounce seconds, so that bursts are handled at once.
+        """
+        changes = self.read_changes(None)
+        while True:
+            more_changes = self.read_changes(debounce)
+            if not more_changes:
+                return changes
+            changes |= more_changes
+
+    def close(self) -> None:
+        """Releases the resources of the watcher"""
+
+
+class InotifyWatcher(WatcherAbstract):
+    """Watcher based on the Linux inotify API"""
+
+    def __init__(self) -> None:
+        if not sys.platform.startswith("linux"):
+            raise OSError("inotify is only available on Linux")
+        self._libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        self._fd = self._libc.inotify_init1(IN_CLOEXEC | IN_NONBLOCK)
+        if self._fd < 0:
+            err = ctypes.get_errno()
+            raise OSError(err, os.strerror(err))
+        self._paths: Dict[int, str] = {}
+        self.overflowed = False
+
+    def add_directory(self, path: str) -> None:
+        """Adds an inotify watch on the directory"""
+        wd = self._libc.inotify_add_watch(self._fd, os.fsencode(path), WATCH_MASK)
+        if wd < 0:
+            err = ctypes.get_errno()
+            if err in (errno.ENOENT, errno.ENOTDIR):
+                return
+            raise OSError(err, os.strerror(err), path)
+        self._paths[wd] = path
+
+    def read_changes(self, timeout: Optional[float]) -> Set[str]:
+        """Reads the pending inotify events"""
+        readable, _, _ = select.select([self._fd], [], [], timeout)
+        if not readable:
+            return set()
+        changes = set()
+        while True:
+            try:
+                buffer = os.read(self._fd, 1 << 16)
+            except BlockingIOError:
+                return changes
+            offset = 0
+            while offset < len(buffer):
+                wd, mask, _, name_len = EVENT_HEADER.unpack_from(buffer, offset)
+                offset += EVENT_HEADER.size
+                name = buffer[offset : offset + name_len].rstrip(b"\0")
+                offset += name_len
+                if mask & IN_Q_OVERFLOW:
+                    self.overflowed = True
+                    continue
+                if mask & IN_IGNORED:
+                    self._paths.pop(wd, None)
+                    continue
+                directory = self._paths.get(wd)
+                if directory is None:
+                    continue
+                if name:
+                    changes.add(os.path.join(directory, os.fsdecode(name)))
+                else:
+                    changes.add(directory)
+
+    def close(self) -> None:
+        """Closes the inotify file descriptor"""
+        os.close(self._fd)
+
+
+class PollingWatcher(WatcherAbstract):
+    """Watcher that lists the watched directories at a regular interval"""
+
+    def __init__(self, interval: float = 1.0) -> None:
+        self.interval = interval
+        self._snapshots: Dict[str, Dict[str, Tuple[int, int]]] = {}
+
+    @staticmethod
+    def _snapshot(path: str) -> Dict[str, Tuple[int, int]]:
+        """Gets the mtime and size of every entry of a directory"""
+        snapshot = {}
+        try:
+            with os.scandir(path) as entries:
+                for entry in entries:
+                    try:
+                        stat = entry.stat()
+                    except FileNotFoundError:
+                        continue
+                    snapshot[entry.name] = (stat.st_mtime_ns, stat.st_size)
+        except (FileNotFoundError, NotADirectoryError):
+            pass
+        return snapshot
+
+    def add_directory(self, path: str) -> None:
+        """Takes a first snapshot of the directory"""
+        self._snapshots[path] = self._snapshot(path)
+
+    def read_changes(self, timeout: Optional[float]) -> Set[str]:
+        """Lists the watched directories until a change is found or the timeout
+        expires
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            changes = set()
+            for path, snapshot in list(self._snapshots.items()):
+                new_snapshot = self._snapshot(path)
+                if new_snapshot == snapshot:
+                    continue
+                self._snapshots[path] = new_snapshot
+                for name in snapshot.keys() | new_snapshot.keys():
+                    if snapshot.get(name) != new_snapshot.get(name):
+                        changes.add(os.path.join(path, name))
+                if not os.path.isdir(path):
+                    del self._snapshots[path]
+            if changes:
+                return changes
+            if deadline is not None and time.monotonic() >= deadline:
+                return changes
+            wait = self.interval
+            if deadline is not None:
+                wait = min(wait, max(0.0, deadline - time.monotonic()))
+            time.sleep(wait)
+
+
+def get_watcher(polling: bool = False, interval: float = 1.0) -> WatcherAbstract:
+    """Gets an inotify watcher if available, a polling watcher otherwise"""
+    if not polling:
+        try:
+            return InotifyWatcher()
+        except (OSError, AttributeError):
+            pass
+    return PollingWatcher(interval=interval)
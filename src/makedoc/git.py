@@ -0,0 +1,85 @@
+"""Implements the queries makedoc makes to the local git binary"""
+
+import os
+import subprocess
+from typing import Dict, List
+
+
+def run_git(cwd: str, *args: str) -> str:
+    """Runs a git command in a directory and gets its output
+
+    Raises:
+        RuntimeError: if git is not installed or the command fails
+    """
+    try:
+        process = subprocess.run(
+            ["git", *args],
+            cwd=cwd,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+        )
+    except FileNotFoundError:
+        raise RuntimeError("The git binary could not be found")
+    if process.returncode != 0:
+        raise RuntimeError(f"git {args[0]} failed: {process.stderr.strip()}")
+    return process.stdout
+
+
+def changed_paths(path: str, ref: str) -> List[str]:
+    """Lists the paths of a directory that differ from a git revision
+
+    The committed, staged and unstaged changes are all reported, along with the
+    untracked files that are not ignored by git. A renamed path is reported under
+    its old and its new name.
+
+    Args:
+        path: str
+            The absolute path of the directory, inside a git working tree
+        ref: str
+            The revision to compare the working tree to
+
+    Returns:
+        List[str]: the absolute paths that changed
+    """
+    diff = run_git(
+        path, "diff", "--name-only", "--no-renames", "--relative", "-z", ref, "--"
+    )
+    untracked = run_git(path, "ls-files", "--others", "--exclude-standard", "-z")
+    return [os.path.join(path, name) for name in (diff + untracked).split("\0") if name]
+
+
+def index_path(path: str) -> str:
+    """Gets the absolute path of the index file of the git repository that
+    contains a directory
+    """
+    git_dir = run_git(path, "rev-parse", "--absolute-git-dir").rstrip("\n")
+    return os.path.join(git_dir, "index")
+
+
+def tracked_files(path: str) -> List[str]:
+    """Lists the files of a directory that are tracked by git, from the index
+
+    The files removed from the working tree, or left out of it by a sparse
+    checkout, are not listed.
+
+    Args:
+        path: str
+            The absolute path of the directory, inside a git working tree
+
+    Returns:
+        List[str]: the paths of the files, relative to the directory
+    """
+    output = run_git(path, "ls-files", "-z", "-t", "--cached", "--deleted")
+    files: Dict[str, None] = {}
+    absent = set()
+    for line in output.split("\0"):
+        if not line:
+            continue
+        # Each path is prefixed by its status tag and a space
+        tag, name = line[0], line[2:]
+        if tag in ("R", "S"):
+            absent.add(name)
+        else:
+            files[name] = None
+    return [name for name in files if name not in absent]
@@ -0,0 +1,420 @@
+"""Implements a compiled view of the makedoc ignore files"""
+
+import os
+import pathlib
+import re
+from typing import Dict, List, Optional, Sequence, Set, Tuple, Union
+
+# The characters that make a line of makedoc.ignored_paths a glob pattern
+GLOB_CHARACTERS = ("*", "?", "[")
+
+
+def is_glob_rule(rule: str) -> bool:
+    """Checks if a rule of makedoc.ignored_paths is a gitignore-style pattern"""
+    return rule.startswith("!") or any(char in rule for char in GLOB_CHARACTERS)
+
+
+def names_existing_entry(rule: str, root_path: Union[str, pathlib.Path]) -> bool:
+    """Checks if a rule of makedoc.ignored_paths is the path of an existing entry,
+    in which case it keeps its literal meaning even if it looks like a pattern
+
+    Args:
+        rule: str
+            The rule, absolute or relative to the project root
+        root_path: Union[str, pathlib.Path]
+            The project root
+    """
+    return os.path.lexists(os.path.join(root_path, rule.rstrip("/") or "/"))
+
+
+# A piece of a gitignore-style pattern: its text, its regular expression, and
+# the character it matches if it is not a wildcard
+_GlobToken = Tuple[str, str, Optional[str]]
+
+
+def _glob_tokens(pattern: str) -> List[_GlobToken]:
+    """Splits a gitignore-style pattern, without its leading and trailing
+    slashes, into the pieces of its regular expression
+    """
+    tokens: List[_GlobToken] = []
+    i = 0
+    n = len(pattern)
+    while i < n:
+        if pattern.startswith("**/", i) and i == 0:
+            tokens.append(("**/", "(?:.*/)?", None))
+            i += 3
+        elif pattern.startswith("/**/", i):
+            tokens.append(("/**/", "/(?:.*/)?", None))
+            i += 4
+        elif pattern.startswith("/**", i) and i + 3 == n:
+            tokens.append(("/**", "/.+", None))
+            i += 3
+        elif pattern[i] == "*":
+            start = i
+            while i < n and pattern[i] == "*":
+                i += 1
+            tokens.append((pattern[start:i], "[^/]*", None))
+        elif pattern[i] == "?":
+            tokens.append(("?", "[^/]", None))
+            i += 1
+        elif pattern[i] == "[" and "]" in pattern[i + 2 :]:
+            end = pattern.index("]", i + 2)
+            chars = pattern[i + 1 : end].replace("\\", "\\\\")
+            if chars[0] == "!":
+                # As "*" and "?", a class does not match slashes
+                chars = "^" + chars[1:] + "/"
+            regex = "[" + chars + "]"
+            tokens.append((pattern[i : end + 1], regex, None))
+            i = end + 1
+        elif pattern[i] == "\\" and i + 1 < n:
+            tokens.append(
+                (pattern[i : i + 2], re.escape(pattern[i + 1]), pattern[i + 1])
+            )
+            i += 2
+        else:
+            tokens.append((pattern[i], re.escape(pattern[i]), pattern[i]))
+            i += 1
+    return tokens
+
+
+def _glob_regex(tokens: Sequence[_GlobToken]) -> str:
+    """Joins the regular expressions of the pieces of a pattern"""
+    return "".join(regex for _, regex, _ in tokens)
+
+
+def _glob_literal(tokens: Sequence[_GlobToken]) -> Optional[str]:
+    """Gets the only text the pieces of a pattern match, None if one of them is
+    a wildcard
+    """
+    literal = []
+    for _, _, char in tokens:
+        if char is None:
+            return None
+        literal.append(char)
+    return "".join(literal)
+
+
+def translate_glob(pattern: str) -> Tuple[str, bool]:
+    """Translates a gitignore-style pattern into a regular expression matching
+    project relative paths
+
+    A pattern that contains a slash, other than a trailing one, is relative to
+    the project root, and otherwise matches names at any depth. "*" and "?" do not
+    match slashes, "**" matches any number of directories.
+
+    Returns:
+        Tuple[str, bool]: the regular expression, and whether the pattern only
+            matches directories
+    """
+    dir_only = pattern.endswith("/")
+    pattern = pattern.rstrip("/")
+    anchored = "/" in pattern
+    prefix = "" if anchored else "(?:.*/)?"
+    return prefix + _glob_regex(_glob_tokens(pattern.lstrip("/"))), dir_only
+
+
+# The regular expressions of the runs of patterns, by decreasing run
+_RunRegexes = List[Tuple[int, "re.Pattern[str]"]]
+
+
+def _compile_runs(regexes: Dict[int, List[str]]) -> _RunRegexes:
+    """Compiles the regular expressions of each run into a single one"""
+    return [
+        (run, re.compile("|".join(regexes[run]), re.DOTALL))
+        for run in sorted(regexes, reverse=True)
+    ]
+
+
+def _last_match(regexes: _RunRegexes, text: str, run: int) -> int:
+    """Gets the last run whose expression matches a text if it is after a run"""
+    for regex_run, regex in regexes:
+        if regex_run <= run:
+            break
+        if regex.fullmatch(text):
+            return regex_run
+    return run
+
+
+class _GlobIndex(object):
+    """The patterns that apply to files, or to directories, sorted by the
+    cheapest check that tells if they match a path.
+
+    Each pattern is only known by the number of its run, and a path lookup gives
+    the last run with a pattern that matches it. The patterns without wildcards
+    are looked up in hash tables, by name, suffix, path or ancestor path. The
+    others are regular expressions joined by run, matched against the name when
+    they apply at any depth or when their directory is literal, in which case
+    they are looked up by directory, and against the whole path otherwise.
+    """
+
+    def __init__(self) -> None:
+        self.names: Dict[str, int] = {}
+        self.suffixes: Dict[str, int] = {}
+        self.paths: Dict[str, int] = {}
+        self.prefixes: Dict[str, int] = {}
+        self._dir_sources: Dict[str, Dict[int, List[str]]] = {}
+        self._dir_tail_sources: Dict[str, Dict[int, List[str]]] = {}
+        self._name_sources: Dict[int, List[str]] = {}
+        self._path_sources: Dict[int, List[str]] = {}
+
+    def add(self, pattern: str, run: int) -> None:
+        """Adds a pattern, without its trailing slash and its "!" """
+        anchored = "/" in pattern
+        tokens = _glob_tokens(pattern.lstrip("/"))
+        if anchored and tokens and tokens[0][0] == "**/":
+            if not any("/" in text for text, _, _ in tokens[1:]):
+                anchored = False
+                tokens = tokens[1:]
+        literal = _glob_literal(tokens)
+        if not anchored:
+            suffix = _glob_literal(tokens[1:])
+            if literal is not None:
+                self.names[literal] = run
+            elif tokens[0][2] is None and tokens[0][0][0] == "*" and suffix:
+                self.suffixes[suffix] = run
+            else:
+                self._name_sources.setdefault(run, []).append(_glob_regex(tokens))
+            return
+        if literal is not None:
+            self.paths[literal] = run
+            return
+        if tokens[-1][0] == "/**":
+            prefix = _glob_literal(tokens[:-1])
+            if prefix:
+                self.prefixes[prefix] = run
+                return
+        # The patterns whose directory is literal, at the root or at any depth
+        # when it follows a "**/", only match the name against an expression
+        any_depth = tokens[0][0] == "**/"
+        path_tokens = tokens[1:] if any_depth else tokens
+        slashes = [i for i, (_, _, char) in enumerate(path_tokens) if char == "/"]
+        if slashes:
+            directory = _glob_literal(path_tokens[: slashes[-1]])
+            name = path_tokens[slashes[-1] + 1 :]
+            if (
+                directory is not None
+                and (directory or not any_depth)
+                and not any("/" in text for text, _, _ in name)
+            ):
+                sources = self._dir_tail_sources if any_depth else self._dir_sources
+                sources.setdefault(directory, {}).setdefault(run, []).append(
+                    _glob_regex(name)
+                )
+                return
+        self._path_sources.setdefault(run, []).append(_glob_regex(tokens))
+
+    def compile(self) -> None:
+        """Compiles the regular expressions, once all the patterns are added"""
+        self._suffix_lengths = sorted({len(suffix) for suffix in self.suffixes})
+        self._dir_regexes = {
+            directory: _compile_runs(sources)
+            for directory, sources in self._dir_sources.items()
+        }
+        self._dir_tail_regexes = {
+            directory: _compile_runs(sources)
+            for directory, sources in self._dir_tail_sources.items()
+        }
+        self._name_regexes = _compile_runs(self._name_sources)
+        self._path_regexes = _compile_runs(self._path_sources)
+
+    def last_run(self, partial_path: str) -> int:
+        """Gets the last run with a pattern matching a path, -1 if there is none"""
+        directory, _, name = partial_path.rpartition("/")
+        run = max(self.names.get(name, -1), self.paths.get(partial_path, -1))
+        for length in self._suffix_lengths:
+            run = max(run, self.suffixes.get(name[-length:], -1))
+        if self.prefixes:
+            i = partial_path.find("/")
+            while i != -1:
+                run = max(run, self.prefixes.get(partial_path[:i], -1))
+                i = partial_path.find("/", i + 1)
+        if self._dir_regexes:
+            run = _last_match(self._dir_regexes.get(directory, []), name, run)
+        if self._dir_tail_regexes and directory:
+            tail = directory
+            while True:
+                run = _last_match(self._dir_tail_regexes.get(tail, []), name, run)
+                i = tail.find("/")
+                if i == -1:
+                    break
+                tail = tail[i + 1 :]
+        run = _last_match(self._name_regexes, name, run)
+        return _last_match(self._path_regexes, partial_path, run)
+
+
+class GlobRules(object):
+    """Gitignore-style patterns, indexed so that checking a path does not depend
+    much on their number.
+
+    As in a .gitignore file, a path is ignored if the last pattern it matches is
+    not negated by a leading "!". The patterns are split into runs of consecutive
+    patterns that are all negated or all not, so that knowing the last run with
+    a pattern that matches a path is enough. The patterns ending with a slash
+    only apply to directories, so the files are looked up in a second index
+    without them.
+    """
+
+    def __init__(self, patterns: Sequence[str]) -> None:
+        self.patterns = list(patterns)
+        self._run_negated: List[bool] = []
+        self._index = _GlobIndex()
+        self._file_index = _GlobIndex()
+        for pattern in self.patterns:
+            negated = pattern.startswith("!")
+            if not self._run_negated or self._run_negated[-1] != negated:
+                self._run_negated.append(negated)
+            run = len(self._run_negated) - 1
+            if negated:
+                pattern = pattern[1:]
+            self._index.add(pattern.rstrip("/"), run)
+            if not pattern.endswith("/"):
+                self._file_index.add(pattern.rstrip("/"), run)
+        self._index.compile()
+        self._file_index.compile()
+
+    def is_ignored(self, partial_path: str, is_file: bool) -> bool:
+        """Checks if a project relative path is ignored by the patterns"""
+        index = self._file_index if is_file else self._index
+        run = index.last_run(partial_path)
+        return run >= 0 and not self._run_negated[run]
+
+    @staticmethod
+    def parse_lines(lines: Sequence[str]) -> List[str]:
+        """Gets the patterns of the lines of a .gitignore file, without the
+        comments and the blank lines
+        """
+        patterns = []
+        for line in lines:
+            pattern = line.rstrip("\n")
+            if not pattern.endswith("\\ "):
+                pattern = pattern.rstrip(" ")
+            if pattern and not pattern.startswith("#"):
+                patterns.append(pattern)
+        return patterns
+
+
+class IgnoreRules(object):
+    """Holds the content of the three makedoc ignore files as hash sets.
+
+    The files are read once, so that checking whether a path is ignored does not
+    cost any file opening and does not depend on the number of rules.
+
+    The lines of makedoc.ignored_paths that start with "!" or contain glob
+    characters are gitignore-style patterns instead, unless they are the path of
+    an existing entry of the project, compiled along with the lines of the
+    project .gitignore file, if it is honored, into a single GlobRules. They are checked after the other rules, so that a negated pattern
+    only brings back what another pattern ignored.
+
+    Attributes:
+        absolute_paths (Set[str])
+            The absolute paths listed in makedoc.ignored_paths
+        partial_paths (Set[str])
+            The project relative paths listed in makedoc.ignored_paths
+        parent_paths (Set[str])
+            The "dir/" entries of makedoc.ignored_paths, whose direct children
+            are ignored
+        names (Set[str])
+            The names listed in makedoc.ignore_every
+        extensions (Set[str])
+            The extensions listed in makedoc.ignored_extensions
+        glob_rules (Optional[GlobRules])
+            The gitignore-style patterns, None if there are none
+    """
+
+    def __init__(
+        self,
+        ignored_paths_lines: List[str],
+        ignore_every_lines: List[str],
+        ignored_extensions_lines: List[str],
+        unpacked_doc_file_name: str,
+        gitignore_lines: Sequence[str] = (),
+        root_path: Optional[Union[str, pathlib.Path]] = None,
+    ) -> None:
+        self.unpacked_doc_file_name = unpacked_doc_file_name
+
+        self.absolute_paths: Set[str] = set()
+        self.partial_paths: Set[str] = set()
+        self.parent_paths: Set[str] = set()
+        glob_patterns = GlobRules.parse_lines(gitignore_lines)
+        for line in ignored_paths_lines:
+            rule = line.strip()
+            if (
+                line[0] != "#"
+                and is_glob_rule(rule)
+                and (root_path is None or not names_existing_entry(rule, root_path))
+            ):
+                glob_patterns.append(rule)
+                continue
+            if line[0] != "#":
+                self.absolute_paths.add(rule)
+            self.partial_paths.add(rule)
+            if rule != "":
+                self.parent_paths.add(rule)
+
+        self.names: Set[str] = {
+            line.strip() for line in ignore_every_lines if line[0] != "#"
+        }
+        self.extensions: Set[str] = {
+            line.strip() for line in ignored_extensions_lines if line[0] != "#"
+        }
+        self.glob_rules: Optional[GlobRules] = (
+            GlobRules(glob_patterns) if glob_patterns else None
+        )
+
+    @classmethod
+    def from_makedoc_paths(cls, makedoc_paths) -> "IgnoreRules":
+        """Reads the ignore files of a makedoc project"""
+        with open(makedoc_paths.ignored_path, "r") as f:
+            ignored_paths_lines = f.readlines()
+        with open(makedoc_paths.ignored_every, "r") as f:
+            ignore_every_lines = f.readlines()
+        with open(makedoc_paths.ignored_extensions, "r") as f:
+            ignored_extensions_lines = f.readlines()
+        gitignore_lines: List[str] = []
+        if makedoc_paths.uses_gitignore and makedoc_paths.gitignore.exists():
+            with open(makedoc_paths.gitignore, "r") as f:
+                gitignore_lines = f.readlines()
+        return cls(
+            ignored_paths_lines,
+            ignore_every_lines,
+            ignored_extensions_lines,
+            makedoc_paths.unpacked_doc_file_name,
+            gitignore_lines,
+            makedoc_paths.root,
+        )
+
+    def is_ignored(
+        self,
+        path: Union[str, pathlib.Path],
+        partial_path: str,
+        name: str,
+        is_file: bool,
+    ) -> bool:
+        """Checks if a path has to be ignored
+
+        Args:
+            path: Union[str, pathlib.Path]
+                The absolute path
+            partial_path: str
+                The path relative to the project root ("" for the root itself)
+            name: str
+                The file or directory name
+            is_file: bool
+                Whether the path is a file, in which case its extension is checked
+        """
+        if name == self.unpacked_doc_file_name:
+            return True
+        if str(path) in self.absolute_paths:
+            return True
+        if partial_path:
+            if partial_path in self.partial_paths:
+                return True
+            if "/".join(partial_path.split("/")[:-1]) + "/" in self.parent_paths:
+                return True
+        if name in self.names:
+            return True
+        if is_file and ".".join(name.split(".")[1:]) in self.extensions:
+            return True
+        if self.glob_rules is not None and partial_path:
+            return self.glob_rules.is_ignored(partial_path, is_file)
+        return False
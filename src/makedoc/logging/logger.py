@@ -1,33 +1,176 @@
 """Defines a logger object for handling makedoc logs"""
 
+import json
 import pathlib
+import sys
+import weakref
 from datetime import datetime
-from typing import List
+from itertools import islice
+from typing import Dict, List, Optional
 
 from makedoc.logging.messages.concept.message_abstract import MessageAbstract
+from makedoc.logging.metrics import Metrics
+from makedoc.logging.profiling import register_metrics
 from makedoc.makedoc_paths import MakedocPaths
 
 
+def _write_console(chunks: List[str]) -> None:
+    """Writes the buffered console output at once"""
+    if chunks:
+        sys.stdout.write("".join(chunks))
+        sys.stdout.flush()
+        chunks.clear()
+
+
 class Logger(object):
-    """Logger object"""
+    """Logger object
+
+    The messages printed in the console are buffered and written by chunks of
+    CONSOLE_BUFFER_SIZE characters, or when the logger is flushed. With the
+    "summary-only" verbosity option, only the number of messages of each code is
+    printed, on flush. The log file is appended the messages logged since the
+    previous flush.
+
+    With the "jsonl" logs option, the messages are also written to a JSON Lines
+    file, along with a summary record of the run so far on every flush: the
+    number of messages of each code, the counters and the time spent in each
+    phase, measured by the metrics object.
 
-    def __init__(self, makedoc_paths: MakedocPaths) -> None:
+    An in_memory logger only keeps the list of messages: it neither prints them
+    nor writes a log file. It is used by the worker processes, whose messages are
+    handed back to the logger of the main process.
+    """
+
+    # The number of characters of console output buffered before being written
+    CONSOLE_BUFFER_SIZE = 1 << 16
+
+    def __init__(self, makedoc_paths: MakedocPaths, in_memory: bool = False) -> None:
         self.makedoc_paths: MakedocPaths = makedoc_paths
+        self.in_memory = in_memory
         self.start_date: datetime = datetime.now()
         self.log_file_name: str = self.start_date.strftime("%Y-%m-%d_%H:%M:%S.log")
         self.log_file_path: pathlib.Path = self.makedoc_paths.logs / self.log_file_name
+        self.jsonl_file_path: pathlib.Path = self.log_file_path.with_suffix(".jsonl")
+        self.metrics = Metrics()
 
-        self.makedoc_paths.logs.mkdir(parents=True, exist_ok=True)
-        self.log_file_path.touch()
+        if not self.in_memory:
+            self.makedoc_paths.logs.mkdir(parents=True, exist_ok=True)
+            self.log_file_path.touch()
+            register_metrics(self.metrics)
 
         self.log_list: List[MessageAbstract] = []
+        self._verbosity: Optional[Dict[str, bool]] = None
+        self._console_chunks: List[str] = []
+        self._console_size: int = 0
+        # The number of messages already written to the log file and summarized
+        self._n_saved_logs: int = 0
+        self._n_summarized_logs: int = 0
+        # The console output is not lost if the run is interrupted
+        weakref.finalize(self, _write_console, self._console_chunks)
+
+    @property
+    def verbosity(self) -> Dict[str, bool]:
+        """Gets the verbosity section of config.json, read once"""
+        if self._verbosity is None:
+            self._verbosity = self.makedoc_paths.config_dict["verbosity"]
+        return self._verbosity
+
+    def _is_printed(self, msg: MessageAbstract) -> bool:
+        """Checks if a message is to be printed in the console"""
+        return (
+            not self.in_memory
+            and msg.VERBOSITY_KEY is not None
+            and self.verbosity[msg.VERBOSITY_KEY]
+        )
 
     def add_log(self, msg: MessageAbstract) -> None:
-        """Adds a message object to the list of logs"""
+        """Adds a message object to the list of logs and prints it if required"""
         self.log_list.append(msg)
+        if not self._is_printed(msg) or self.verbosity.get("summary-only", False):
+            return
+        line = msg.console_line + "\n"
+        self._console_chunks.append(line)
+        self._console_size += len(line)
+        if self._console_size >= self.CONSOLE_BUFFER_SIZE:
+            self.flush_console()
+
+    def _summarize(self) -> None:
+        """Buffers the number of messages of each code logged since the previous
+        summary
+        """
+        counts: Dict[int, int] = {}
+        first_messages: Dict[int, MessageAbstract] = {}
+        for msg in islice(self.log_list, self._n_summarized_logs, None):
+            if self._is_printed(msg):
+                counts[msg.code] = counts.get(msg.code, 0) + 1
+                first_messages.setdefault(msg.code, msg)
+        self._n_summarized_logs = len(self.log_list)
+        for code, msg in first_messages.items():
+            self._console_chunks.append(
+                f"{msg.format(msg.VERBOSE_TOKEN)} {counts[code]} x {msg.content}"
+                f" (code {code})\n"
+            )
+
+    def flush_console(self) -> None:
+        """Writes the buffered console output"""
+        if self.in_memory:
+            return
+        if self.verbosity.get("summary-only", False):
+            self._summarize()
+        _write_console(self._console_chunks)
+        self._console_size = 0
+
+    @property
+    def writes_jsonl(self) -> bool:
+        """Whether the messages are also written to a JSON Lines file"""
+        return not self.in_memory and self.makedoc_paths.config_dict.get(
+            "logs", {}
+        ).get("jsonl", False)
 
     def save_log_file(self) -> None:
-        """Saves the log file"""
-        with open(self.log_file_path, "w") as f:
-            for msg in self.log_list:
-                f.write(msg.log_file_line)
+        """Appends the messages logged since the previous save to the log file"""
+        if self.in_memory:
+            return
+        with open(self.log_file_path, "a") as f:
+            f.writelines(
+                msg.log_file_line
+                for msg in islice(self.log_list, self._n_saved_logs, None)
+            )
+        if self.writes_jsonl:
+            with open(self.jsonl_file_path, "a") as f:
+                f.writelines(
+                    json.dumps(msg.json_record) + "\n"
+                    for msg in islice(self.log_list, self._n_saved_logs, None)
+                )
+        self._n_saved_logs = len(self.log_list)
+
+    @property
+    def summary_record(self) -> Dict:
+        """Builds the JSON Lines record that sums up the run so far"""
+        message_counts: Dict[str, int] = {}
+        for msg in self.log_list:
+            code = str(msg.code)
+            message_counts[code] = message_counts.get(code, 0) + 1
+        now = datetime.now()
+        return {
+            "type": "summary",
+            "time": now.isoformat(),
+            "duration": (now - self.start_date).total_seconds(),
+            "messages": message_counts,
+            "counters": self.metrics.counters,
+            "phases": {
+                phase: {
+                    "calls": self.metrics.phase_calls[phase],
+                    "seconds": seconds,
+                }
+                for phase, seconds in self.metrics.phase_seconds.items()
+            },
+        }
+
+    def flush(self) -> None:
+        """Writes the buffered console output and saves the log files"""
+        self.flush_console()
+        self.save_log_file()
+        if self.writes_jsonl:
+            with open(self.jsonl_file_path, "a") as f:
+                f.write(json.dumps(self.summary_record) + "\n")
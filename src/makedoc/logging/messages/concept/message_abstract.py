@@ -1,7 +1,7 @@
 """Defines what a message should look like"""
 import pathlib
 from datetime import datetime
-from typing import Optional, Tuple, Union
+from typing import Dict, Optional, Tuple, Union
 
 from makedoc.makedoc_paths import MakedocPaths
 
@@ -14,6 +14,8 @@ class MessageAbstract(object):
     CONTENT: str = ""
     SOLUTION: str = ""
     VERBOSE_TOKEN: str = "[MSG]"
+    # The key of config.json "verbosity" section that enables console printing
+    VERBOSITY_KEY: Optional[str] = None
 
     def __init__(
         self,
@@ -53,13 +55,30 @@ class MessageAbstract(object):
         """Builds the line description for the log file"""
         return self.VERBOSE_TOKEN + " " + self.line_description + "\n"
 
+    @property
+    def json_record(self) -> Dict:
+        """Builds the record of the message for the JSON Lines log file"""
+        return {
+            "type": "message",
+            "level": self.VERBOSE_TOKEN[1:-1],
+            "code": self.code,
+            "path": self.file_path_str,
+            "content": self.content,
+            "time": self.time.isoformat(),
+        }
+
     def format(self, s: str) -> str:
         """Formats a string with the message inner color scheme"""
         return s.join(self.FMT)
 
+    @property
+    def console_line(self) -> str:
+        """Builds the line printed in the console"""
+        return self.format(self.VERBOSE_TOKEN) + " " + self.line_description
+
     def print_in_console(self) -> None:
         """Verboses the message in the console"""
-        print(self.format(self.VERBOSE_TOKEN) + " " + self.line_description)
+        print(self.console_line)
 
 
 class ErrorAbstract(MessageAbstract):
@@ -67,18 +86,7 @@ class ErrorAbstract(MessageAbstract):
 
     FMT: Tuple[str, str] = ("\x1b[1;31;48m", "\x1b[0m")
     VERBOSE_TOKEN: str = "[ERR]"
-
-    def __init__(
-        self,
-        file_path_str: Union[str, pathlib.Path],
-        makedoc_paths: MakedocPaths,
-        content: Optional[str] = None,
-        code: Optional[int] = None,
-        solution: Optional[str] = None,
-    ) -> None:
-        super().__init__(file_path_str, makedoc_paths, content, code, solution)
-        if self.makedoc_paths.config_dict["verbosity"]["print-error"]:
-            self.print_in_console()
+    VERBOSITY_KEY: Optional[str] = "print-error"
 
 
 class WarningAbstract(MessageAbstract):
@@ -86,18 +94,7 @@ class WarningAbstract(MessageAbstract):
 
     FMT: Tuple[str, str] = ("\x1b[1;33;48m", "\x1b[0m")
     VERBOSE_TOKEN: str = "[WNG]"
-
-    def __init__(
-        self,
-        file_path_str: Union[str, pathlib.Path],
-        makedoc_paths: MakedocPaths,
-        content: Optional[str] = None,
-        code: Optional[int] = None,
-        solution: Optional[str] = None,
-    ) -> None:
-        super().__init__(file_path_str, makedoc_paths, content, code, solution)
-        if self.makedoc_paths.config_dict["verbosity"]["print-warning"]:
-            self.print_in_console()
+    VERBOSITY_KEY: Optional[str] = "print-warning"
 
 
 class InfoAbstract(MessageAbstract):
@@ -105,18 +102,7 @@ class InfoAbstract(MessageAbstract):
 
     FMT: Tuple[str, str] = ("\x1b[1;36;48m", "\x1b[0m")
     VERBOSE_TOKEN: str = "[NFO]"
-
-    def __init__(
-        self,
-        file_path_str: Union[str, pathlib.Path],
-        makedoc_paths: MakedocPaths,
-        content: Optional[str] = None,
-        code: Optional[int] = None,
-        solution: Optional[str] = None,
-    ) -> None:
-        super().__init__(file_path_str, makedoc_paths, content, code, solution)
-        if self.makedoc_paths.config_dict["verbosity"]["print-info"]:
-            self.print_in_console()
+    VERBOSITY_KEY: Optional[str] = "print-info"
 
 
 class SuccessAbstract(MessageAbstract):
@@ -124,15 +110,4 @@ class SuccessAbstract(MessageAbstract):
 
     FMT: Tuple[str, str] = ("\x1b[1;32;48m", "\x1b[0m")
     VERBOSE_TOKEN: str = "[SCS]"
-
-    def __init__(
-        self,
-        file_path_str: Union[str, pathlib.Path],
-        makedoc_paths: MakedocPaths,
-        content: Optional[str] = None,
-        code: Optional[int] = None,
-        solution: Optional[str] = None,
-    ) -> None:
-        super().__init__(file_path_str, makedoc_paths, content, code, solution)
-        if self.makedoc_paths.config_dict["verbosity"]["print-success"]:
-            self.print_in_console()
+    VERBOSITY_KEY: Optional[str] = "print-success"
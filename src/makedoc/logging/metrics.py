@@ -0,0 +1,96 @@
+"""Defines a metrics object that measures where the time of a run goes"""
+
+import contextlib
+from time import perf_counter
+from typing import Dict, Iterator, List, Optional
+
+
+class Metrics(object):
+    """Accumulates counters and the time spent in each phase of a run.
+
+    The phases are timed exclusively: the time spent in a phase that is nested in
+    another one, like parsing a file while rendering a doc file, only counts for
+    the nested phase. Hot paths use start() and stop() directly, which only cost
+    two clock readings.
+
+    Attributes:
+        counters (Dict[str, int])
+            The counters, like the number of files written
+        phase_seconds (Dict[str, float])
+            The time spent in each phase
+        phase_calls (Dict[str, int])
+            The number of times each phase was entered
+    """
+
+    def __init__(self) -> None:
+        self.counters: Dict[str, int] = {}
+        self.phase_seconds: Dict[str, float] = {}
+        self.phase_calls: Dict[str, int] = {}
+        # For every open phase, the time spent in its nested phases
+        self._nested_seconds: List[float] = []
+
+    def start(self) -> float:
+        """Opens a phase and returns its start time, to be given to stop()"""
+        self._nested_seconds.append(0.0)
+        return perf_counter()
+
+    def stop(self, phase: str, start: float) -> None:
+        """Closes the last opened phase"""
+        seconds = perf_counter() - start
+        self.add_time(phase, seconds - self._nested_seconds.pop(), nested=seconds)
+
+    @contextlib.contextmanager
+    def phase(self, phase: str) -> Iterator[None]:
+        """Times the block as a phase"""
+        start = self.start()
+        try:
+            yield
+        finally:
+            self.stop(phase, start)
+
+    def add_time(
+        self,
+        phase: str,
+        seconds: float,
+        calls: int = 1,
+        nested: Optional[float] = None,
+    ) -> None:
+        """Adds time spent in a phase, measured by the caller
+
+        Args:
+            phase: str
+                The name of the phase
+            seconds: float
+                The time spent in the phase only
+            calls: int
+                The number of times the phase was entered
+            nested: Optional[float]
+                The time to deduce from the enclosing phase, if not seconds
+        """
+        self.phase_seconds[phase] = self.phase_seconds.get(phase, 0.0) + seconds
+        self.phase_calls[phase] = self.phase_calls.get(phase, 0) + calls
+        if self._nested_seconds:
+            self._nested_seconds[-1] += seconds if nested is None else nested
+
+    def count(self, counter: str, n: int = 1) -> None:
+        """Increments a counter"""
+        self.counters[counter] = self.counters.get(counter, 0) + n
+
+    def merge(self, other: "Metrics") -> None:
+        """Adds the metrics of another process, a worker"""
+        for counter, n in other.counters.items():
+            self.count(counter, n)
+        for phase, seconds in other.phase_seconds.items():
+            self.phase_seconds[phase] = self.phase_seconds.get(phase, 0.0) + seconds
+            self.phase_calls[phase] = (
+                self.phase_calls.get(phase, 0) + other.phase_calls[phase]
+            )
+
+    def __getstate__(self) -> Dict:
+        """Sends the metrics of a worker without its open phases"""
+        return {
+            "counters": self.counters,
+            "phase_seconds": self.phase_seconds,
+            "phase_calls": self.phase_calls,
+            "_nested_seconds": [],
+        }
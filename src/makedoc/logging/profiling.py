@@ -0,0 +1,97 @@
+"""Implements the profiling of a whole makedoc run, as enabled by the --profile
+option of the command line interface.
+"""
+
+import cProfile
+import pathlib
+from time import perf_counter
+from typing import List, Optional
+
+from makedoc.logging.metrics import Metrics
+
+# The profile of the current run, if profiling is enabled
+_active_profile: Optional["RunProfile"] = None
+
+
+class RunProfile(object):
+    """Collects the metrics of every logger created during a run and reports
+    where the time went.
+
+    The metrics only cost a few clock readings per file. A cProfile profile of
+    the run can be dumped on top of them, at the price of a much slower run.
+    """
+
+    def __init__(self, pstats_path: Optional[pathlib.Path] = None) -> None:
+        self.pstats_path = pstats_path
+        self.metrics: List[Metrics] = []
+        self._start: float = 0.0
+        self._seconds: float = 0.0
+        self._profiler: Optional[cProfile.Profile] = None
+
+    def start(self) -> None:
+        """Makes the profile the active one and starts timing the run"""
+        global _active_profile
+        _active_profile = self
+        if self.pstats_path is not None:
+            self._profiler = cProfile.Profile()
+            self._profiler.enable()
+        self._start = perf_counter()
+
+    def stop(self) -> None:
+        """Stops timing the run and dumps the cProfile statistics if required"""
+        global _active_profile
+        self._seconds = perf_counter() - self._start
+        if self._profiler is not None:
+            self._profiler.disable()
+            self._profiler.dump_stats(self.pstats_path)
+        _active_profile = None
+
+    @property
+    def total(self) -> Metrics:
+        """Gets the sum of the metrics of the run"""
+        total = Metrics()
+        for metrics in self.metrics:
+            total.merge(metrics)
+        return total
+
+    def report(self) -> str:
+        """Builds the report of the run, the phases being ranked by time spent
+
+        The time of the phases run by worker processes is summed, so that it can
+        exceed the duration of the run. The percentages are then given relative to
+        the summed time.
+        """
+        total = self.total
+        phases = sorted(total.phase_seconds.items(), key=lambda item: -item[1])
+        other_seconds = max(self._seconds - sum(total.phase_seconds.values()), 0.0)
+        reference_seconds = max(self._seconds, sum(total.phase_seconds.values()))
+        lines = [
+            f"Profile of the run: {self._seconds:.3f}s",
+            "",
+            f"{'phase':<12}{'calls':>10}{'seconds':>12}{'%':>8}{'us/call':>12}",
+        ]
+        for phase, seconds in phases:
+            calls = total.phase_calls[phase]
+            lines.append(
+                f"{phase:<12}{calls:>10}{seconds:>12.3f}"
+                f"{100 * seconds / (reference_seconds or 1):>8.1f}"
+                f"{1e6 * seconds / (calls or 1):>12.1f}"
+            )
+        lines.append(
+            f"{'other':<12}{'':>10}{other_seconds:>12.3f}"
+            f"{100 * other_seconds / (reference_seconds or 1):>8.1f}"
+        )
+        if total.counters:
+            lines.append("")
+            lines += [
+                f"{counter:<22}{n:>12}" for counter, n in sorted(total.counters.items())
+            ]
+        if self.pstats_path is not None:
+            lines += ["", f"cProfile statistics written to {self.pstats_path}"]
+        return "\n".join(lines)
+
+
+def register_metrics(metrics: Metrics) -> None:
+    """Adds the metrics of a logger to the profile of the current run, if any"""
+    if _active_profile is not None:
+        _active_profile.metrics.append(metrics)
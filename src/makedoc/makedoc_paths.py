@@ -2,6 +2,14 @@ import json
 import pathlib
 from typing import Optional
 
+from makedoc.ignore_rules import IgnoreRules
+from makedoc.packed_doc_store import (
+    JsonPackedDocStore,
+    PackedDocStore,
+    SqlitePackedDocStore,
+)
+from makedoc.parse_cache import ParseCache
+from makedoc.render_cache import RenderCache
 from makedoc.utils.config_dict_struc import CfgDict
 
 
@@ -9,6 +17,8 @@ class MakedocPaths:
     """Contains all the paths used by the package.
 
     Attributes:
+        root (pathlib.Path)
+            The path to the project root
         logs (pathlib.Path)
             The path to .makedoc/logs/  # TODO: Implement logging
         config (pathlib.Path)
@@ -16,6 +26,15 @@ class MakedocPaths:
         packed_doc (pathlib.Path)
             The path to the packed doc file.
             .makedoc/packed_doc.json
+        packed_doc_db (pathlib.Path)
+            The path to the packed doc database, used by the sqlite backend.
+            .makedoc/packed_doc.sqlite3
+        render_cache_path (pathlib.Path)
+            The path to the cache of the rendered doc files.
+            .makedoc/render_cache.json
+        cache (pathlib.Path)
+            The path to the directory of the parse cache.
+            .makedoc/cache/
         ignored_path (pathlib.Path)
             The path to the ignored paths file.
             .makedoc/config/makedoc.ignored_paths
@@ -28,12 +47,24 @@ class MakedocPaths:
         files_naming (pathlib.Path)
             The path to the files naming file.
             .makedoc/config/makedoc.files_naming.json
+        gitignore (pathlib.Path)
+            The path to the .gitignore file of the project, honored if the
+            "gitignore" key of the "ignore" config is set.
+            .gitignore
 
     Properties:
         unpacked_doc_file_name (str)
             The file name of the directory unpacked doc
         autodoc_file_name (str)
             The file name of the doc md files (default: README.md)
+        ignore_rules (IgnoreRules)
+            The compiled content of the ignore files, read once
+        packed_doc_store (PackedDocStore)
+            The packed directory docs, stored by the backend of the config
+        render_cache (RenderCache)
+            The in-memory content of the render cache file, read once
+        parse_cache (ParseCache)
+            The persistent cache of the python files docstrings
     """
 
     def __init__(self, source_path: pathlib.Path) -> None:
@@ -41,20 +72,29 @@ class MakedocPaths:
         makedoc = source_path / ".makedoc"
         config = makedoc / "config"
 
+        self.root = source_path
         self.logs = makedoc / "logs"
         self.config = makedoc / "config"
 
         self.packed_doc = makedoc / "packed_doc.json"
+        self.packed_doc_db = makedoc / "packed_doc.sqlite3"
+        self.render_cache_path = makedoc / "render_cache.json"
+        self.cache = makedoc / "cache"
 
         self.ignored_path = config / "makedoc.ignored_paths"
         self.ignored_every = config / "makedoc.ignore_every"
         self.ignored_extensions = config / "makedoc.ignored_extensions"
         self.files_naming = config / "makedoc.files_naming.json"
         self.config_json = config / "config.json"
+        self.gitignore = source_path / ".gitignore"
 
         self._unpacked_doc_file_name: Optional[str] = None
         self._autodoc_file_name: Optional[str] = None
         self._config_dict: Optional[CfgDict] = None
+        self._ignore_rules: Optional[IgnoreRules] = None
+        self._packed_doc_store: Optional[PackedDocStore] = None
+        self._render_cache: Optional[RenderCache] = None
+        self._parse_cache: Optional[ParseCache] = None
 
     def _read_files_naming(self):
         """Reads the files naming configuration"""
@@ -84,3 +124,60 @@ class MakedocPaths:
         if self._autodoc_file_name is None:
             self._read_files_naming()
         return self._autodoc_file_name
+
+    @property
+    def uses_gitignore(self) -> bool:
+        """Whether the .gitignore file of the project adds to the ignore rules"""
+        return self.config_dict.get("ignore", {}).get("gitignore", False)
+
+    @property
+    def ignore_rules(self) -> IgnoreRules:
+        """Gets the ignore rules of the project"""
+        if self._ignore_rules is None:
+            self._ignore_rules = IgnoreRules.from_makedoc_paths(self)
+        return self._ignore_rules
+
+    @property
+    def packed_doc_store(self) -> PackedDocStore:
+        """Gets the store of the packed directory docs, for the "backend" of the
+        "packed-doc" config: "json" or "sqlite"
+        """
+        if self._packed_doc_store is None:
+            backend = self.config_dict.get("packed-doc", {}).get("backend", "json")
+            if backend == "json":
+                self._packed_doc_store = JsonPackedDocStore(self.packed_doc)
+            elif backend == "sqlite":
+                self._packed_doc_store = SqlitePackedDocStore(
+                    self.packed_doc_db, self.packed_doc
+                )
+            else:
+                raise ValueError(f"Unknown packed doc backend: {backend}")
+        return self._packed_doc_store
+
+    @property
+    def render_cache(self) -> RenderCache:
+        """Gets the cache of the rendered doc files"""
+        if self._render_cache is None:
+            self._render_cache = RenderCache(self.render_cache_path)
+        return self._render_cache
+
+    @property
+    def parse_cache(self) -> ParseCache:
+        """Gets the cache of the python files docstrings"""
+        if self._parse_cache is None:
+            parse_cache_config = self.config_dict.get("parse-cache", {})
+            self._parse_cache = ParseCache(
+                self.cache,
+                enabled=parse_cache_config.get("enabled", True),
+                max_bytes=parse_cache_config.get("max-bytes", 64 << 20),
+            )
+        return self._parse_cache
+
+    def flush_stores(self) -> None:
+        """Writes the in-memory stores that were modified during the run"""
+        if self._packed_doc_store is not None:
+            self._packed_doc_store.flush()
+        if self._render_cache is not None:
+            self._render_cache.flush()
+        if self._parse_cache is not None:
+            self._parse_cache.flush()
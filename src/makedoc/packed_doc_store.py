@@ -0,0 +1,227 @@
+"""Implements the stores of the packed directory docs
+
+The docs are stored either in .makedoc/packed_doc.json, which has to be read as
+a whole, or in an SQLite database, .makedoc/packed_doc.sqlite3, where the doc of
+a single directory is looked up by its partial path. Both can be converted into
+each other without loss, see dump_packed_doc and load_packed_doc.
+"""
+
+import json
+import os
+import pathlib
+import sqlite3
+from abc import ABC, abstractmethod
+from typing import Dict, List, Optional, Set
+
+from makedoc.utils.atomic_file import write_atomically
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS packed_doc (
+    path TEXT PRIMARY KEY,
+    doc TEXT NOT NULL
+) WITHOUT ROWID;
+"""
+
+
+def load_packed_doc(path: pathlib.Path) -> Dict[str, str]:
+    """Reads packed docs from a file in the json format"""
+    with open(path, "r") as f:
+        return json.load(f)
+
+
+def dump_packed_doc(packed_doc: Dict[str, str], path: pathlib.Path) -> None:
+    """Writes packed docs atomically to a file in the json format"""
+    write_atomically(
+        path,
+        lambda f: json.dump(
+            packed_doc, f, indent=4, separators=(",", ": "), sort_keys=True
+        ),
+    )
+
+
+class PackedDocStore(ABC):
+    """In-memory view of the packed directory docs
+
+    The entries are read from the storage when first accessed. Modified entries
+    are tracked and only saved by flush(). The packed dirdoc files are removed by
+    flush() too, once their content is saved.
+
+    Attributes:
+        path (pathlib.Path)
+            The path of the file the docs are stored in
+        entries (Dict[str, str])
+            The entries read or modified so far
+    """
+
+    def __init__(self, path: pathlib.Path) -> None:
+        self.path = path
+        self.entries: Dict[str, str] = {}
+        self.dirty_keys: Set[str] = set()
+        self.packed_file_paths: List[pathlib.Path] = []
+
+    @abstractmethod
+    def _read_entry(self, partial_path: str) -> Optional[str]:
+        """Reads the doc of a directory from the storage, None if it has none"""
+
+    @abstractmethod
+    def _save_entries(self) -> None:
+        """Saves the modified entries to the storage"""
+
+    @abstractmethod
+    def read_all(self) -> Dict[str, str]:
+        """Reads all the docs from the storage, as they are saved
+
+        Raises:
+            ValueError: if the storage is corrupted
+        """
+
+    @abstractmethod
+    def replace_all(self, packed_doc: Dict[str, str]) -> None:
+        """Replaces all the saved docs, the modified entries being dropped"""
+
+    def get(self, partial_path: str) -> Optional[str]:
+        """Gets the doc of a directory, None if it has none"""
+        if partial_path not in self.entries:
+            doc = self._read_entry(partial_path)
+            if doc is None:
+                return None
+            self.entries[partial_path] = doc
+        return self.entries[partial_path]
+
+    def __contains__(self, partial_path: str) -> bool:
+        return self.get(partial_path) is not None
+
+    def __getitem__(self, partial_path: str) -> str:
+        doc = self.get(partial_path)
+        if doc is None:
+            raise KeyError(partial_path)
+        return doc
+
+    def __setitem__(self, partial_path: str, doc: str) -> None:
+        if self.get(partial_path) != doc:
+            self.entries[partial_path] = doc
+            self.dirty_keys.add(partial_path)
+
+    def setdefault(self, partial_path: str, doc: str) -> str:
+        """Registers the doc if the path has no entry yet, and returns the entry"""
+        if partial_path not in self:
+            self[partial_path] = doc
+        return self.entries[partial_path]
+
+    def pack(self, partial_path: str, doc: str, dirdoc_path: pathlib.Path) -> None:
+        """Registers the doc of a dirdoc file, to be removed on flush"""
+        self[partial_path] = doc
+        self.packed_file_paths.append(dirdoc_path)
+
+    @property
+    def is_dirty(self) -> bool:
+        """Whether some entries have been modified since the last flush"""
+        return bool(self.dirty_keys)
+
+    def flush(self) -> None:
+        """Saves the modified entries if there are some, then removes the packed
+        dirdoc files
+        """
+        if self.is_dirty:
+            self._save_entries()
+            self.dirty_keys.clear()
+        for dirdoc_path in self.packed_file_paths:
+            os.remove(dirdoc_path)
+        self.packed_file_paths.clear()
+
+
+class JsonPackedDocStore(PackedDocStore):
+    """Stores the packed docs in .makedoc/packed_doc.json
+
+    The json file is read as a whole on first access, and rewritten as a whole,
+    atomically, when some entries were modified.
+    """
+
+    def __init__(self, path: pathlib.Path) -> None:
+        super(JsonPackedDocStore, self).__init__(path)
+        self._loaded: bool = False
+
+    def _read_entry(self, partial_path: str) -> Optional[str]:
+        if not self._loaded:
+            self.entries = {**self.read_all(), **self.entries}
+            self._loaded = True
+        return self.entries.get(partial_path)
+
+    def _save_entries(self) -> None:
+        dump_packed_doc(self.entries, self.path)
+
+    def read_all(self) -> Dict[str, str]:
+        return load_packed_doc(self.path)
+
+    def replace_all(self, packed_doc: Dict[str, str]) -> None:
+        dump_packed_doc(packed_doc, self.path)
+        self.entries = dict(packed_doc)
+        self.dirty_keys.clear()
+        self._loaded = True
+
+
+class SqlitePackedDocStore(PackedDocStore):
+    """Stores the packed docs in an SQLite database, .makedoc/packed_doc.sqlite3
+
+    The docs are looked up one directory at a time, by their partial path, and
+    the modified entries are written in a single transaction. The database is
+    filled from the json file, if there is one, when it is first created.
+    """
+
+    def __init__(self, path: pathlib.Path, json_path: pathlib.Path) -> None:
+        super(SqlitePackedDocStore, self).__init__(path)
+        self.json_path = json_path
+        self._connection: Optional[sqlite3.Connection] = None
+
+    def _connect(self) -> sqlite3.Connection:
+        """Opens the database, creating it if needed"""
+        if self._connection is None:
+            connection = sqlite3.connect(self.path, timeout=30)
+            connection.executescript(SCHEMA)
+            with connection:
+                # Only one process gets to insert the row, and fills the database
+                created = connection.execute(
+                    "INSERT OR IGNORE INTO meta VALUES ('imported', ?)",
+                    (self.json_path.name,),
+                ).rowcount
+                if created and self.json_path.exists():
+                    connection.executemany(
+                        "INSERT OR REPLACE INTO packed_doc VALUES (?, ?)",
+                        load_packed_doc(self.json_path).items(),
+                    )
+            self._connection = connection
+        return self._connection
+
+    def _read_entry(self, partial_path: str) -> Optional[str]:
+        row = (
+            self._connect()
+            .execute("SELECT doc FROM packed_doc WHERE path = ?", (partial_path,))
+            .fetchone()
+        )
+        return None if row is None else row[0]
+
+    def _save_entries(self) -> None:
+        with self._connect() as connection:
+            connection.executemany(
+                "INSERT OR REPLACE INTO packed_doc VALUES (?, ?)",
+                ((key, self.entries[key]) for key in self.dirty_keys),
+            )
+
+    def read_all(self) -> Dict[str, str]:
+        try:
+            return dict(self._connect().execute("SELECT path, doc FROM packed_doc"))
+        except sqlite3.DatabaseError as e:
+            raise ValueError(f"The packed doc database cannot be read: {e}")
+
+    def replace_all(self, packed_doc: Dict[str, str]) -> None:
+        with self._connect() as connection:
+            connection.execute("DELETE FROM packed_doc")
+            connection.executemany(
+                "INSERT INTO packed_doc VALUES (?, ?)", packed_doc.items()
+            )
+        self.entries = dict(packed_doc)
+        self.dirty_keys.clear()
@@ -0,0 +1,236 @@
+"""Implements a persistent cache of the docstrings extracted from python files"""
+
+import json
+import pathlib
+import sqlite3
+import time
+from typing import Dict, List, NamedTuple, Optional, Set
+
+from makedoc import __VERSION__
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS docstrings (
+    path TEXT PRIMARY KEY,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    lines TEXT,
+    bytes INTEGER NOT NULL,
+    last_used INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS docstrings_last_used ON docstrings (last_used);
+"""
+
+# Files modified less than this many nanoseconds before being parsed may be
+# modified again without their mtime changing, so they are not cached
+RACY_DELAY_NS = 2_000_000_000
+
+# The granularity, in seconds, of the last use dates of the entries. The dates of
+# the entries used several times within the same period are only written once.
+LAST_USED_PERIOD = 3600
+
+
+class ParsedDocstring(NamedTuple):
+    """The docstring extracted from a file, along with the stat of the file"""
+
+    mtime_ns: int
+    size: int
+    # None when the file has no docstring
+    lines: Optional[List[str]]
+
+
+class ParseCacheChanges(NamedTuple):
+    """What a process changed in the cache since its last flush"""
+
+    new_entries: Dict[str, ParsedDocstring]
+    used_keys: Set[str]
+    hits: int
+    misses: int
+
+
+class ParseCache(object):
+    """Stores the docstrings of the python files in .makedoc/cache/, so that the
+    files that did not change since the previous run are not read again.
+
+    Entries are keyed by the file partial path and are only valid for the mtime
+    and size the file had when it was parsed. They are read from an SQLite
+    database one at a time, while the new entries are kept in memory and written
+    at once by flush(). The least recently used entries are evicted when the
+    cache grows over max_bytes.
+    """
+
+    FILE_NAME = "parse_cache.sqlite3"
+
+    def __init__(
+        self, cache_dir: pathlib.Path, enabled: bool = True, max_bytes: int = 64 << 20
+    ) -> None:
+        self.cache_dir = cache_dir
+        self.db_path = cache_dir / self.FILE_NAME
+        self.enabled = enabled
+        self.max_bytes = max_bytes
+        self._connection: Optional[sqlite3.Connection] = None
+        self.new_entries: Dict[str, ParsedDocstring] = {}
+        self.used_keys: Set[str] = set()
+        self.hits: int = 0
+        self.misses: int = 0
+
+    @staticmethod
+    def _period() -> int:
+        """Gets the current last use period"""
+        return int(time.time()) // LAST_USED_PERIOD
+
+    def _connect(self, create: bool) -> Optional[sqlite3.Connection]:
+        """Opens the database, None if it does not exist and create is not set.
+
+        The entries written by another version of makedoc are discarded.
+        """
+        if self._connection is None:
+            if not create and not self.db_path.exists():
+                return None
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            connection = sqlite3.connect(self.db_path, timeout=30)
+            connection.executescript(SCHEMA)
+            row = connection.execute(
+                "SELECT value FROM meta WHERE key = 'version'"
+            ).fetchone()
+            if row is None or row[0] != json.dumps(__VERSION__):
+                with connection:
+                    connection.execute("DELETE FROM docstrings")
+                    connection.execute("DELETE FROM meta")
+                    connection.execute(
+                        "INSERT INTO meta VALUES ('version', ?)",
+                        (json.dumps(__VERSION__),),
+                    )
+            self._connection = connection
+        return self._connection
+
+    def get(
+        self, partial_path: str, mtime_ns: int, size: int
+    ) -> Optional[ParsedDocstring]:
+        """Gets the docstring of a file, if it was cached for the same stat"""
+        if not self.enabled:
+            return None
+        entry = self.new_entries.get(partial_path)
+        if entry is None:
+            connection = self._connect(create=False)
+            row = None
+            if connection is not None:
+                row = connection.execute(
+                    "SELECT mtime_ns, size, lines, last_used FROM docstrings "
+                    "WHERE path = ?",
+                    (partial_path,),
+                ).fetchone()
+            if row is not None:
+                lines = None if row[2] is None else json.loads(row[2])
+                entry = ParsedDocstring(row[0], row[1], lines)
+                if row[3] != self._period():
+                    self.used_keys.add(partial_path)
+        if entry is None or entry.mtime_ns != mtime_ns or entry.size != size:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return entry
+
+    def put(self, partial_path: str, entry: ParsedDocstring) -> None:
+        """Caches the docstring of a file, unless it was modified too recently"""
+        if not self.enabled or time.time_ns() - entry.mtime_ns < RACY_DELAY_NS:
+            return
+        self.new_entries[partial_path] = entry
+
+    @property
+    def changes(self) -> ParseCacheChanges:
+        """Gets what was changed since the last flush"""
+        return ParseCacheChanges(
+            self.new_entries, self.used_keys, self.hits, self.misses
+        )
+
+    def merge(self, changes: ParseCacheChanges) -> None:
+        """Adds what another process, a worker, changed in the cache"""
+        self.new_entries.update(changes.new_entries)
+        self.used_keys |= changes.used_keys
+        self.hits += changes.hits
+        self.misses += changes.misses
+
+    def flush(self) -> None:
+        """Writes the new entries and the last use dates, then evicts the least
+        recently used entries if the cache is too large.
+        """
+        if not self.enabled or not (self.hits or self.misses):
+            return
+        connection = self._connect(create=True)
+        period = self._period()
+        with connection:
+            connection.executemany(
+                "UPDATE docstrings SET last_used = ? WHERE path = ?",
+                ((period, key) for key in self.used_keys),
+            )
+            rows = []
+            for key, entry in self.new_entries.items():
+                lines = None if entry.lines is None else json.dumps(entry.lines)
+                n_bytes = len(key) + len(lines or "") + 32
+                rows.append((key, entry.mtime_ns, entry.size, lines, n_bytes, period))
+            connection.executemany(
+                "INSERT OR REPLACE INTO docstrings VALUES (?, ?, ?, ?, ?, ?)", rows
+            )
+            for key, count in (("hits", self.hits), ("misses", self.misses)):
+                connection.execute("INSERT OR IGNORE INTO meta VALUES (?, '0')", (key,))
+                connection.execute(
+                    "UPDATE meta SET value = CAST(value AS INTEGER) + ? WHERE key = ?",
+                    (count, key),
+                )
+            if rows:
+                self._evict(connection)
+        self.new_entries.clear()
+        self.used_keys.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def _evict(self, connection: sqlite3.Connection) -> None:
+        """Removes the least recently used entries beyond max_bytes"""
+        (n_bytes,) = connection.execute(
+            "SELECT COALESCE(SUM(bytes), 0) FROM docstrings"
+        ).fetchone()
+        if n_bytes > self.max_bytes:
+            connection.execute(
+                "DELETE FROM docstrings WHERE path IN ("
+                "SELECT path FROM ("
+                "SELECT path, SUM(bytes) OVER (ORDER BY last_used DESC, path) AS total "
+                "FROM docstrings"
+                ") WHERE total > ?"
+                ")",
+                (self.max_bytes,),
+            )
+
+    def stats(self) -> Dict[str, int]:
+        """Gets the number of entries, their size and the cumulated hits and misses
+        of the cache
+        """
+        stats = {"entries": 0, "bytes": 0, "file-size": 0, "hits": 0, "misses": 0}
+        connection = self._connect(create=False)
+        if connection is None:
+            return stats
+        row = connection.execute(
+            "SELECT COUNT(*), COALESCE(SUM(bytes), 0) FROM docstrings"
+        ).fetchone()
+        stats["entries"], stats["bytes"] = row
+        stats["file-size"] = self.db_path.stat().st_size
+        for key, value in connection.execute(
+            "SELECT key, value FROM meta WHERE key IN ('hits', 'misses')"
+        ):
+            stats[key] = int(value)
+        return stats
+
+    def clear(self) -> None:
+        """Removes the cache database"""
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+        for path in self.cache_dir.glob(self.FILE_NAME + "*"):
+            path.unlink()
+        self.new_entries.clear()
+        self.used_keys.clear()
+        self.hits = 0
+        self.misses = 0
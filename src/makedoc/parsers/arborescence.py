@@ -0,0 +1,48 @@
+"""Implements the rendering of the file arborescence of a directory
+
+The arborescence of a tree is stored once, as a flat list of entries in
+depth-first order. Each directory parser of the tree refers to the slice of the
+list that holds its subtree, so that the structure of any directory can be
+rendered from the shared list in a time linear in the size of its output.
+"""
+
+from itertools import islice
+from typing import List, Tuple
+
+FCROSS = "└── "
+CROSSDIR = "├── "
+VERTLINE = "│   "
+NOTHING = "    "
+
+# (depth, is the last child of its parent, label)
+ArborescenceEntry = Tuple[int, bool, str]
+
+
+def render_arborescence(entries: List[ArborescenceEntry], start: int, end: int) -> str:
+    """Renders the arborescence held by a slice of the entries
+
+    Args:
+        entries: List[ArborescenceEntry]
+            The depth-first ordered entries of a tree
+        start: int
+            The index of the entry of the directory to render
+        end: int
+            The index that follows the last entry of the directory subtree
+    """
+    base_depth = entries[start][0]
+    lines = [entries[start][2]]
+    # prefixes[i] is the prefix of the lines that are i + 1 levels below the root,
+    # only extended when an entry turns out to have children
+    prefixes = [""]
+    prefix = ""
+    is_last = True
+    for depth, is_last_child, label in islice(entries, start + 1, end):
+        level = depth - base_depth
+        if level > len(prefixes):
+            prefixes.append(prefix + (NOTHING if is_last else VERTLINE))
+        elif level < len(prefixes):
+            del prefixes[level:]
+        prefix = prefixes[level - 1]
+        is_last = is_last_child
+        lines.append(prefix + (FCROSS if is_last else CROSSDIR) + label)
+    return "\n".join(lines)
@@ -1,6 +1,6 @@
 """Implements a blueprint class for file parsers"""
 
-from typing import List
+from typing import Iterator, List, Optional
 
 from .parser_abstract import ParserAbstract
 
@@ -10,6 +10,8 @@ class FileParserAbstract(ParserAbstract):
     this class.
     """
 
+    __slots__ = ()
+
     def __init__(self, **kwargs):
         super(FileParserAbstract, self).__init__(**kwargs)
 
@@ -22,6 +24,14 @@ class FileParserAbstract(ParserAbstract):
         """The default doc for a file is empty. The file is ignored"""
         return ""
 
+    @property
+    def doc_fingerprint(self) -> str:
+        """A string that changes whenever the parsed doc may change.
+
+        The default doc is always empty, so is its fingerprint.
+        """
+        return ""
+
     @property
     def content_txt_lines(self) -> List[str]:
         """Implements a method to read the content of the file as text
@@ -32,4 +42,38 @@ class FileParserAbstract(ParserAbstract):
         """
         with open(self.path, "r") as f:
             lines = f.readlines()
+        self.logger.metrics.count("files-opened")
+        self.logger.metrics.count("chars-read", sum(map(len, lines)))
         return lines
+
+    def iter_content_txt_lines(self, max_chars: Optional[int] = None) -> Iterator[str]:
+        """Reads the content of the file as text, line by line
+
+        Args:
+            max_chars: Optional[int]
+                The number of characters after which the reading stops. A line
+                that is cut by this limit is not returned.
+
+        Yields:
+            line: str
+                The lines strings
+        """
+        metrics = self.logger.metrics
+        metrics.count("files-opened")
+        n_chars = 0
+        try:
+            with open(self.path, "r") as f:
+                if max_chars is None:
+                    for line in f:
+                        n_chars += len(line)
+                        yield line
+                    return
+                while max_chars > 0:
+                    line = f.readline(max_chars)
+                    max_chars -= len(line)
+                    n_chars += len(line)
+                    if not line or (max_chars == 0 and line[-1] != "\n"):
+                        return
+                    yield line
+        finally:
+            metrics.count("chars-read", n_chars)
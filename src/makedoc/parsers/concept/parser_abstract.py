@@ -1,6 +1,7 @@
 """Implements a blueprint class for all parsers"""
 
 import pathlib
+import sys
 from abc import ABC, abstractmethod, abstractproperty
 from typing import Optional, Tuple
 
@@ -9,32 +10,101 @@ from makedoc.logging.logger import Logger
 from makedoc.makedoc_paths import MakedocPaths
 
 
+class ParserTree(object):
+    """What all the parsers of a tree share"""
+
+    __slots__ = (
+        "top_path",
+        "root_path",
+        "makedoc_paths",
+        "logger",
+        "owns_logger",
+        "tree_listing",
+    )
+
+    def __init__(
+        self,
+        top_path: pathlib.Path,
+        root_path: pathlib.Path,
+        makedoc_paths: MakedocPaths,
+        logger: Logger,
+        owns_logger: bool,
+    ) -> None:
+        self.top_path = top_path
+        self.root_path = root_path
+        self.makedoc_paths = makedoc_paths
+        self.logger = logger
+        self.owns_logger = owns_logger
+        # The listing the directories are built from, instead of the file system
+        self.tree_listing = None
+
+
 class ParserAbstract(ABC):
-    """Abstract class for parsers to define the mandatory methods"""
+    """Abstract class for parsers to define the mandatory methods
+
+    The parsers are kept small, for huge trees to fit in memory. A parser created
+    by its parent directory only stores its name, interned, and its parent: its
+    path is rebuilt from the ones of its ancestors, while the project paths and
+    the logger are shared by the whole tree.
+    """
+
+    __slots__ = ("name", "parent", "parsed_doc", "_tree", "_is_file")
 
     VERSION = __VERSION__
 
     def __init__(
         self,
-        path: pathlib.Path,
-        root_path: pathlib.Path,
+        path: Optional[pathlib.Path] = None,
+        root_path: Optional[pathlib.Path] = None,
         logger: Optional[Logger] = None,
         makedoc_path: Optional[MakedocPaths] = None,
+        is_file: Optional[bool] = None,
+        parent: Optional["ParserAbstract"] = None,
+        name: Optional[str] = None,
     ):
-        self.path = path
-        self.root_path = root_path
-        self.name = str(self.path).split("/")[-1]
-
-        self.parsed_doc: str = ""
-        if makedoc_path is None:
-            self.makedoc_paths = MakedocPaths(root_path)
+        self.parent = parent
+        if parent is None:
+            self.name = sys.intern(str(path).split("/")[-1])
+            if makedoc_path is None:
+                makedoc_path = MakedocPaths(root_path)
+            owns_logger = logger is None
+            if logger is None:
+                logger = Logger(makedoc_path)
+            self._tree = ParserTree(path, root_path, makedoc_path, logger, owns_logger)
         else:
-            self.makedoc_paths = makedoc_path
-        self.source_parser: bool = False
-        if logger is None:
-            logger = Logger(self.makedoc_paths)
-            self.source_parser = True
-        self.logger = logger
+            self.name = sys.intern(name)
+            self._tree = parent._tree
+        # Known when the parser is created from a directory listing, checked on
+        # the file system otherwise
+        self._is_file = is_file
+        self.parsed_doc: str = ""
+
+    @property
+    def path(self) -> pathlib.Path:
+        """Gets the absolute path of the parser"""
+        if self.parent is None:
+            return self._tree.top_path
+        return self.parent.path / self.name
+
+    @property
+    def root_path(self) -> pathlib.Path:
+        """Gets the path of the makedoc project"""
+        return self._tree.root_path
+
+    @property
+    def makedoc_paths(self) -> MakedocPaths:
+        """Gets the paths of the makedoc project"""
+        return self._tree.makedoc_paths
+
+    @property
+    def logger(self) -> Logger:
+        """Gets the logger shared by the tree"""
+        return self._tree.logger
+
+    @property
+    def source_parser(self) -> bool:
+        """Whether the parser is the top of a tree that created its own logger"""
+        return self.parent is None and self._tree.owns_logger
 
     @abstractmethod
     def get_parsed_doc(self) -> str:
@@ -51,47 +121,28 @@ class ParserAbstract(ABC):
     @property
     def is_ignored(self) -> bool:
         """Checks if the parser should be ignored"""
-        if self.name == self.makedoc_paths.unpacked_doc_file_name:
-            return True
-        with open(self.makedoc_paths.ignored_path, "r") as f:
-            lines = f.readlines()
-        for line in lines:
-            if self.partial_path:
-                if (
-                    line[0] != "#"
-                    and line.strip() == str(self.path)
-                    or line.strip() == self.partial_path
-                    or (
-                        line.strip()
-                        == "/".join(self.partial_path.split("/")[:-1]) + "/"
-                        and line.strip() != ""
-                    )
-                ):
-                    return True
-            else:
-                if line[0] != "#" and line.strip() == str(self.path):
-                    return True
-        with open(self.makedoc_paths.ignored_every, "r") as f:
-            lines = f.readlines()
-        for line in lines:
-            if line[0] != "#" and line.strip() == self.name:
-                return True
-        if self.path.is_file():
-            with open(self.makedoc_paths.ignored_extensions, "r") as f:
-                lines = f.readlines()
-            for line in lines:
-                if line[0] != "#" and line.strip() == ".".join(
-                    self.name.split(".")[1:]
-                ):
-                    return True
-        return False
+        return self.makedoc_paths.ignore_rules.is_ignored(
+            self.path, self.partial_path, self.name, self.is_file
+        )
+
+    @property
+    def is_file(self) -> bool:
+        """Checks if the path of the parser is a file"""
+        if self._is_file is None:
+            self._is_file = self.path.is_file()
+        return self._is_file
 
     @property
     def partial_path(self) -> str:
         """Gets the partial path of the parser"""
-        fullpath = str(self.path.absolute())
-        root_path = str(self.root_path.absolute())
-        return fullpath[len(root_path) + 1 :]
+        if self.parent is None:
+            fullpath = str(self.path.absolute())
+            root_path = str(self.root_path.absolute())
+            return fullpath[len(root_path) + 1 :]
+        parent_partial_path = self.parent.partial_path
+        if parent_partial_path:
+            return parent_partial_path + "/" + self.name
+        return self.name
 
     def __repr__(self):
         """Gets the representation of the parser"""
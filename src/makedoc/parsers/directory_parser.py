@@ -1,100 +1,301 @@
 """Implements a parser class for directories"""
 
 import datetime
-import json
+import hashlib
 import os
 import pathlib
-from typing import Dict, List, Optional, Type
-
+import sys
+from itertools import islice
+from time import perf_counter
+from typing import (
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Type,
+    Union,
+)
+
+from makedoc.doc_writer import format_date, write_doc_file
 from makedoc.logging.messages.info import ParsingStartsInfo
 from makedoc.logging.messages.success import ParsingFinishedSuccess
 from makedoc.logging.messages.warnings import EmptyDirdocWarning
+from makedoc.render_cache import hash_text
 
+from .arborescence import ArborescenceEntry, render_arborescence
 from .concept import FileParserAbstract, ParserAbstract
+from .parallel import apply_in_pool, prefetch_structures
 from .pyscript_parser import PyscriptParser
+from .tree_listing import TreeListing
+
+# A file child: its parser, or only its name if its extension has no parser
+FileEntry = Union[FileParserAbstract, str]
+
+
+def _entry_name(entry: FileEntry) -> str:
+    """Gets the name of a file child"""
+    return entry if isinstance(entry, str) else entry.name
 
 
 class DirectoryParser(ParserAbstract):
-    """Parser class for directories"""
+    """Parser class for directories
+
+    When lazy is set, the directory content is only mined on the first access to
+    dir_children or file_children, so that only the visited part of the tree is
+    built. The children inherit the laziness of their parent.
+
+    The directories are listed on the file system, unless a tree listing is given
+    to the top of the tree, for instance from the git index.
+
+    The files whose extension has no parser in EXTENSION_MATCHING only show in the
+    structure, so only their names are kept. Their parsers are built on the first
+    access to file_children.
+    """
 
     # File extensions supported and their parsers
     EXTENSION_MATCHING: Dict[str, Type[FileParserAbstract]] = {"py": PyscriptParser}
 
-    def __init__(self, **kwargs):
+    # The stages of a pipeline and the methods applying them to one directory
+    PIPELINE_STAGES: Dict[str, str] = {
+        "pack": "_pack_own_doc",
+        "update": "_update_own_doc",
+        "check": "_check_own_parsing",
+    }
+
+    __slots__ = (
+        "lazy",
+        "_path",
+        "_partial_path",
+        "_dir_children",
+        "_file_children",
+        "_file_arborescence_repr",
+        "_arborescence",
+        "_dirdoc_packed",
+    )
+
+    def __init__(
+        self, lazy: bool = False, tree_listing: Optional[TreeListing] = None, **kwargs
+    ):
+        kwargs.setdefault("is_file", False)
         super(DirectoryParser, self).__init__(**kwargs)
-
-        self.dir_children: List[DirectoryParser] = []
-        self.file_children: List[FileParserAbstract] = []
-        if not self.is_ignored:
+        if tree_listing is not None:
+            self._tree.tree_listing = tree_listing
+
+        # The paths of the directories are kept, for their children to build
+        # theirs from them
+        self._path: Optional[pathlib.Path] = None
+        self._partial_path: Optional[str] = None
+        self.lazy = lazy
+        self._dir_children: Optional[List[DirectoryParser]] = None
+        self._file_children: Optional[List[FileEntry]] = None
+        self._file_arborescence_repr: Optional[str] = None
+        # The shared list of arborescence entries and the slice of the subtree
+        self._arborescence: Optional[Tuple[List[ArborescenceEntry], int, int]] = None
+        # Set once the dirdoc file is packed, its content being in the packed doc
+        self._dirdoc_packed = False
+        if self.is_ignored:
+            self._dir_children = []
+            self._file_children = []
+        else:
             self._init_packed_doc()
+            if not self.lazy:
+                self._mine_for_doc()
+
+    @property
+    def path(self) -> pathlib.Path:
+        """Gets the absolute path of the directory"""
+        if self._path is None:
+            self._path = super(DirectoryParser, self).path
+        return self._path
+
+    @property
+    def partial_path(self) -> str:
+        """Gets the partial path of the directory"""
+        if self._partial_path is None:
+            self._partial_path = super(DirectoryParser, self).partial_path
+        return self._partial_path
+
+    @property
+    def tree_listing(self) -> Optional[TreeListing]:
+        """Gets the listing the tree is built from, None if the directories are
+        listed on the file system
+        """
+        return self._tree.tree_listing
+
+    @property
+    def dir_children(self) -> List["DirectoryParser"]:
+        """Gets the non-ignored subdirectories parsers, sorted by name"""
+        if self._dir_children is None:
+            self._mine_for_doc()
+        return self._dir_children
+
+    @property
+    def file_children(self) -> List[FileParserAbstract]:
+        """Gets the non-ignored files parsers, sorted by name"""
+        if self._file_children is None:
+            self._mine_for_doc()
+        if any(isinstance(entry, str) for entry in self._file_children):
+            self._file_children = [
+                (
+                    FileParserAbstract(parent=self, name=entry)
+                    if isinstance(entry, str)
+                    else entry
+                )
+                for entry in self._file_children
+            ]
+        return self._file_children
+
+    @property
+    def file_names(self) -> List[str]:
+        """Gets the names of the non-ignored files, sorted, without building
+        their parsers
+        """
+        if self._file_children is None:
+            self._mine_for_doc()
+        return [_entry_name(entry) for entry in self._file_children]
+
+    @property
+    def doc_file_children(self) -> List[FileParserAbstract]:
+        """Gets the parsers of the non-ignored files whose extension has one,
+        sorted by name
+        """
+        if self._file_children is None:
             self._mine_for_doc()
+        return [entry for entry in self._file_children if not isinstance(entry, str)]
 
     def _init_packed_doc(self) -> None:
         """Initialised packed doc entry if not registered"""
 
-        with open(self.makedoc_paths.packed_doc, "r") as f:
-            packed_doc: Dict[str, str] = json.load(f)
-
-        if self.partial_path not in packed_doc.keys():
-            packed_doc[self.partial_path] = f"# {self.name}\n"
-            with open(self.makedoc_paths.packed_doc, "w+") as f:
-                json.dump(
-                    packed_doc, f, indent=4, separators=(",", ": "), sort_keys=True
-                )
+        metrics = self.logger.metrics
+        packed_doc_start = metrics.start()
+        self.makedoc_paths.packed_doc_store.setdefault(
+            self.partial_path, f"# {self.name}\n"
+        )
+        metrics.stop("packed-doc", packed_doc_start)
 
     def _mine_for_doc(self) -> None:
         """Digs inside the file arborescence for documenting parsers.
 
         When a directory is found, inits a DirectoryParser
-        When a file is found, checks if its extension is supported, or initialise a
-        default FileParser
+        When a file is found, checks if its extension is supported, or only keeps
+        its name
+
+        The entries already know their type, see _list_entries: the ignore rules
+        are checked before any parser is built and no further stat is needed.
         """
-        self.dir_children: List[DirectoryParser] = []
-        self.file_children: List[FileParserAbstract] = []
-        for fname in os.listdir(self.path):
-            if (self.path / fname).is_dir():
-                child = DirectoryParser(
-                    path=self.path / fname,
-                    root_path=self.root_path,
-                    logger=self.logger,
-                    makedoc_path=self.makedoc_paths,
+        metrics = self.logger.metrics
+        walk_start = metrics.start()
+        ignore_seconds = 0.0
+        n_entries = 0
+        dir_children: List[DirectoryParser] = []
+        file_children: List[FileEntry] = []
+        ignore_rules = self.makedoc_paths.ignore_rules
+        partial_path_prefix = self.partial_path + "/" if self.partial_path else ""
+        for n_entries, (fname, entry_path, is_dir, is_file) in enumerate(
+            self._list_entries(), start=1
+        ):
+            partial_path = partial_path_prefix + fname
+            ignore_start = perf_counter()
+            is_ignored = ignore_rules.is_ignored(
+                entry_path, partial_path, fname, is_file
+            )
+            ignore_seconds += perf_counter() - ignore_start
+            if is_ignored:
+                continue
+            if is_dir:
+                dir_children.append(
+                    DirectoryParser(parent=self, name=fname, lazy=self.lazy)
                 )
-                if not child.is_ignored:
-                    self.dir_children.append(child)
             else:
-                if fname.split(".")[-1] in self.EXTENSION_MATCHING.keys():
-                    child = self.EXTENSION_MATCHING[fname.split(".")[-1]](
-                        path=self.path / fname,
-                        root_path=self.root_path,
-                        logger=self.logger,
-                        makedoc_path=self.makedoc_paths,
-                    )
+                file_parser_class = self.EXTENSION_MATCHING.get(fname.split(".")[-1])
+                if file_parser_class is None:
+                    file_children.append(sys.intern(fname))
                 else:
-                    child = FileParserAbstract(
-                        path=self.path / fname,
-                        root_path=self.root_path,
-                        logger=self.logger,
-                        makedoc_path=self.makedoc_paths,
+                    file_children.append(
+                        file_parser_class(parent=self, name=fname, is_file=is_file)
                     )
-                if not child.is_ignored:
-                    self.file_children.append(child)
-        self.dir_children.sort(key=lambda x: x.name)
-        self.file_children.sort(key=lambda x: x.name)
-
-    def get_parsed_doc(self) -> str:
-        """Returns the doc for the parser.
-        Directory doc is stored in .makedoc/packed_doc.json
+        dir_children.sort(key=lambda x: x.name)
+        file_children.sort(key=_entry_name)
+        self._dir_children = dir_children
+        self._file_children = file_children
+        metrics.add_time("ignore", ignore_seconds, calls=n_entries)
+        metrics.stop("walk", walk_start)
+
+    def _list_entries(self) -> Iterator[Tuple[str, str, bool, bool]]:
+        """Lists the entries of the directory, from the tree listing if there is
+        one, with os.scandir otherwise, whose entries already know their type.
+
+        Yields:
+            Tuple[str, str, bool, bool]: the name and the path of each entry, and
+                whether it is a directory and a file
         """
+        tree_listing = self._tree.tree_listing
+        if tree_listing is not None:
+            path = str(self.path)
+            for fname, is_dir in tree_listing.entries(self.partial_path).items():
+                yield fname, os.path.join(path, fname), is_dir, not is_dir
+            return
+        with os.scandir(self.path) as entries:
+            for entry in entries:
+                if entry.is_dir():
+                    yield entry.name, entry.path, True, False
+                else:
+                    yield entry.name, entry.path, False, entry.is_file()
+
+    def refresh_children(self) -> None:
+        """Mines the directory again after its content changed.
 
-        if self.makedoc_paths.unpacked_doc_file_name in os.listdir(self.path):
+        The parsers of the children that are still there are kept, along with
+        everything they already parsed. The structure of the directory is
+        forgotten, the one of its ancestors has to be forgotten by the caller.
+        """
+        previous_children: Dict[str, Union[ParserAbstract, str]] = {
+            _entry_name(child): child
+            for child in (self._dir_children or []) + (self._file_children or [])
+        }
+
+        def kept(child):
+            previous = previous_children.get(_entry_name(child))
+            if isinstance(child, str):
+                # A parser that was built for a name only entry stays
+                return previous if isinstance(previous, FileParserAbstract) else child
+            return previous if type(previous) is type(child) else child
+
+        self._mine_for_doc()
+        self._dir_children = [kept(child) for child in self._dir_children]
+        self._file_children = [kept(child) for child in self._file_children]
+        self.forget_structure()
+
+    def forget_structure(self) -> None:
+        """Forgets the structure of the directory, so that it is collected again"""
+        self._arborescence = None
+        self._file_arborescence_repr = None
+
+    def _has_entry(self, name: str) -> bool:
+        """Checks if the directory contains an entry, with a single lstat"""
+        return os.path.lexists(os.path.join(self.path, name))
+
+    def _read_doc(self) -> str:
+        """Reads the directory doc, from the dirdoc file if it is unpacked"""
+        if not self._dirdoc_packed and self._has_entry(
+            self.makedoc_paths.unpacked_doc_file_name
+        ):
             with open(self.path / self.makedoc_paths.unpacked_doc_file_name, "r") as f:
                 doc = "".join(f.readlines())
+            self.logger.metrics.count("files-opened")
+            self.logger.metrics.count("chars-read", len(doc))
+            return doc
+        return self.makedoc_paths.packed_doc_store[self.partial_path]
 
-        else:
-            with open(self.makedoc_paths.packed_doc, "r") as f:
-                packed_doc: Dict[str, str] = json.load(f)
-            doc = packed_doc[self.partial_path]
+    def get_parsed_doc(self) -> str:
+        """Returns the doc for the parser.
+        Directory doc is stored in .makedoc/packed_doc.json
+        """
 
+        doc = self._read_doc()
         if doc == "# " + self.name + "\n":
             self.logger.add_log(EmptyDirdocWarning(*self._message_args))
         return doc
@@ -102,11 +303,22 @@ class DirectoryParser(ParserAbstract):
     def get_doc_file_content(self) -> str:
         """Builds the README doc file content automatically"""
 
-        content = ""
+        return "".join(self.iter_doc_file_content())
+
+    def iter_doc_file_content(self) -> Iterator[str]:
+        """Builds the README doc file content chunk by chunk"""
 
-        content += self.get_parsed_doc()
+        yield from self._iter_undated_doc_file_content()
+        yield format_date(datetime.datetime.now())
 
-        content += (
+    def _iter_undated_doc_file_content(self) -> Iterator[str]:
+        """Builds the README doc file content chunk by chunk, without the
+        generation date.
+        """
+
+        yield self.get_parsed_doc()
+
+        yield (
             "\n"
             '<hr style="border:2px solid gray"> </hr>\n'
             "\n"
@@ -114,31 +326,28 @@ class DirectoryParser(ParserAbstract):
             "\n"
             "```\n"
         )
-        content += self.file_arborescence_repr
-        content += "\n```\n" '<hr style="border:2px solid gray"> </hr>\n' "\n"
+        yield self.file_arborescence_repr
+        yield "\n```\n" '<hr style="border:2px solid gray"> </hr>\n' "\n"
 
         for subdir in self.dir_children:
-            subdirdoc = subdir.get_parsed_doc()
-            for line in subdirdoc.split("\n"):
-                if line[:1] == "#":
-                    content += f"#{line}\n"
-                else:
-                    content += f">{line}\n"
-            content += "\n" "---\n" "\n"
+            yield self._quote_child_doc(subdir.get_parsed_doc())
+            yield "\n" "---\n" "\n"
 
-        for file in self.file_children:
+        for file in self.doc_file_children:
             filedoc = file.get_parsed_doc()
             if filedoc:
-                for line in filedoc.split("\n"):
-                    if line[:1] == "#":
-                        content += f"#{line}\n"
-                    else:
-                        content += f">{line}\n"
-                content += "\n" "---\n" "\n"
+                yield self._quote_child_doc(filedoc)
+                yield "\n" "---\n" "\n"
 
-        content += f'\n\n\n\n<sub>This doc was automatically generated with makedoc v{self.VERSION} on {datetime.datetime.now().strftime(" %D %H:%M:%S ")}'
+        yield f"\n\n\n\n<sub>This doc was automatically generated with makedoc v{self.VERSION} on "
 
-        return content
+    @staticmethod
+    def _quote_child_doc(doc: str) -> str:
+        """Quotes the doc of a child, with its headers one level down"""
+        return "".join(
+            f"#{line}\n" if line[:1] == "#" else f">{line}\n"
+            for line in doc.split("\n")
+        )
 
     @property
     def file_arborescence_repr(self) -> str:
@@ -164,29 +373,105 @@ class DirectoryParser(ParserAbstract):
             │   ├── pyscript_parser.py
             │   └── source_directory_parser.py
             └── __init__.py
+
+        The arborescence of the whole subtree is collected in a single pass and
+        shared with the subdirectories, then the representation is rendered once
+        and kept for the parser lifetime.
         """
-        FCROSS = "└── "
-        CROSSDIR = "├── "
-        VERTLINE = "│   "
-        NOTHING = "    "
-        output = self.name + "/\n"
-        n_childs = len(self.dir_children) + len(self.file_children)
-        i = 0
-        for subdir in self.dir_children:
-            i += 1
-            subdir_hierarchy = subdir.file_arborescence_repr
-            marker = CROSSDIR if i != n_childs else FCROSS
-            for line in subdir_hierarchy.split("\n"):
-                output += marker + line + "\n"
-                marker = VERTLINE if i != n_childs else NOTHING
-        for subfile in self.file_children:
-            i += 1
-            marker = CROSSDIR if i != n_childs else FCROSS
-            output += marker + subfile.file_arborescence_repr + "\n"
-        return output[:-1]
+        if self._file_arborescence_repr is None:
+            with self.logger.metrics.phase("structure"):
+                if self._arborescence is None:
+                    self._collect_arborescence([], depth=0, is_last=True)
+                self._file_arborescence_repr = render_arborescence(*self._arborescence)
+        return self._file_arborescence_repr
+
+    def _collect_arborescence(
+        self, entries: List[ArborescenceEntry], depth: int, is_last: bool
+    ) -> None:
+        """Appends the arborescence entries of the subtree to a shared list, and
+        keeps the slice that holds them.
+
+        A subtree that was already collected, possibly by a worker process, is
+        copied instead of being walked again.
+        """
+        start = len(entries)
+        if self._arborescence is not None:
+            sub_entries, sub_start, sub_end = self._arborescence
+            shift = depth - sub_entries[sub_start][0]
+            entries.append((depth, is_last, sub_entries[sub_start][2]))
+            entries.extend(
+                (sub_depth + shift, sub_is_last, label)
+                for sub_depth, sub_is_last, label in islice(
+                    sub_entries, sub_start + 1, sub_end
+                )
+            )
+        else:
+            entries.append((depth, is_last, self.name + "/"))
+            dir_children = self.dir_children
+            file_children = self._file_children
+            n_childs = len(dir_children) + len(file_children)
+            i = 0
+            for subdir in dir_children:
+                i += 1
+                subdir._collect_arborescence(entries, depth + 1, i == n_childs)
+            for subfile in file_children:
+                i += 1
+                entries.append(
+                    (
+                        depth + 1,
+                        i == n_childs,
+                        (
+                            subfile
+                            if isinstance(subfile, str)
+                            else subfile.file_arborescence_repr
+                        ),
+                    )
+                )
+        self._arborescence = (entries, start, len(entries))
+
+    @property
+    def arborescence_entries(self) -> List[ArborescenceEntry]:
+        """Gets the arborescence entries of the subtree, the directory being at
+        depth 0
+        """
+        if self._arborescence is None:
+            with self.logger.metrics.phase("structure"):
+                self._collect_arborescence([], depth=0, is_last=True)
+        entries, start, end = self._arborescence
+        if start == 0 and end == len(entries) and entries[0][0] == 0:
+            return entries
+        base_depth = entries[start][0]
+        return [
+            (depth - base_depth, is_last, label)
+            for depth, is_last, label in islice(entries, start, end)
+        ]
+
+    def _apply(self, actions: Sequence[str], recurse=False) -> None:
+        """Applies methods in order to the directory, then to all its
+        subdirectories if recurse is set.
+        """
+        for action in actions:
+            getattr(self, action)()
+        if recurse:
+            for child_dir in self.dir_children:
+                child_dir._apply(actions, recurse=True)
+
+    def _apply_with_jobs(self, actions: Sequence[str], recurse=False, jobs=1) -> None:
+        """Applies methods to the directory and possibly its subdirectories.
+
+        With more than one job, the independent subtrees are parsed by a pool of
+        processes. Without recursion, the pool only builds the structure of the
+        subdirectories.
+        """
+        if jobs > 1 and recurse:
+            apply_in_pool(self, actions, jobs)
+        else:
+            if jobs > 1:
+                prefetch_structures(self, jobs)
+            self._apply(actions, recurse=recurse)
 
     def save_readme(
-        self, recurse=False, save_path: Optional[pathlib.Path] = None
+        self, recurse=False, save_path: Optional[pathlib.Path] = None, jobs=1
     ) -> None:
         """Saves the doc content into a readme file.
 
@@ -195,48 +480,232 @@ class DirectoryParser(ParserAbstract):
 
         if self.source_parser:
             self.logger.add_log(ParsingStartsInfo(*self._message_args))
+        if jobs > 1:
+            prefetch_structures(self, jobs)
         if save_path is None:
             save_path = self.path / self.makedoc_paths.autodoc_file_name
-        with open(save_path, "w+") as f:
-            f.write(self.get_doc_file_content())
+        self._write_doc_file(save_path)
         if recurse:
             for child_dir in self.dir_children:
                 child_dir.save_readme(recurse=True, save_path=save_path)
         if self.source_parser:
             self.logger.add_log(ParsingFinishedSuccess(*self._message_args))
-            self.logger.save_log_file()
+            self.logger.flush()
+            self.makedoc_paths.flush_stores()
         return
 
-    def check_parsing(self, recurse=False) -> None:
-        if self.source_parser:
-            self.logger.add_log(ParsingStartsInfo(*self._message_args))
-        _ = self.get_doc_file_content()
-        if recurse:
-            for child_dir in self.dir_children:
-                child_dir.check_parsing(recurse=True)
-        if self.source_parser:
-            self.logger.add_log(ParsingFinishedSuccess(*self._message_args))
-            self.logger.save_log_file()
-        return
+    def _write_doc_file(self, save_path: pathlib.Path) -> str:
+        """Streams the doc file content to the file, unless the file already
+        holds it.
+
+        Depending on the "keep-unchanged-date" output option, a file whose content
+        only differs by its generation date is also left untouched.
 
-    def update_doc(self, recurse=False) -> None:
+        Returns:
+            str: the hash of the doc file content, without the generation date
+        """
+        metrics = self.logger.metrics
+        # The subtree is walked before the temporary file of the writer is created,
+        # otherwise it could show up in the structure
+        with metrics.phase("render"):
+            _ = self.file_arborescence_repr
+        content_hash = hashlib.sha1()
+
+        def hashed_chunks() -> Iterator[str]:
+            chunks = self._iter_undated_doc_file_content()
+            while True:
+                render_start = metrics.start()
+                chunk = next(chunks, None)
+                metrics.stop("render", render_start)
+                if chunk is None:
+                    return
+                content_hash.update(chunk.encode())
+                yield chunk
+
+        with metrics.phase("write"):
+            written = write_doc_file(
+                save_path,
+                hashed_chunks(),
+                format_date(datetime.datetime.now()),
+                keep_unchanged_date=self.makedoc_paths.config_dict.get(
+                    "output", {}
+                ).get("keep-unchanged-date", True),
+            )
+        metrics.count("files-opened")
+        if written:
+            metrics.count("files-written")
+            metrics.count("bytes-written", os.stat(save_path).st_size)
+        return content_hash.hexdigest()
+
+    def _check_own_parsing(self) -> None:
+        """Builds the doc of the directory without writing it"""
+        with self.logger.metrics.phase("render"):
+            for _ in self.iter_doc_file_content():
+                pass
+
+    def check_parsing(self, recurse=False, jobs=1) -> None:
+        self.run_pipeline(["check"], recurse=recurse, jobs=jobs)
+
+    def _render_inputs_hash(self) -> str:
+        """Hashes everything the doc file content depends on, apart from the date.
+
+        The file docs are represented by their fingerprints, so that no file has to
+        be read.
+        """
+        inputs = [str(self.VERSION), self._read_doc(), self.file_arborescence_repr]
+        inputs += [subdir._read_doc() for subdir in self.dir_children]
+        inputs += [
+            (
+                entry + ":"
+                if isinstance(entry, str)
+                else entry.name + ":" + entry.doc_fingerprint
+            )
+            for entry in self._file_children
+        ]
+        return hash_text("\0".join(inputs))
+
+    def _update_own_doc(self) -> None:
+        """Updates the readme file of the directory only.
+
+        The file is left untouched if it was rendered from the same inputs, and not
+        modified since, according to the render cache.
+        """
+        if not self._has_entry(self.makedoc_paths.autodoc_file_name):
+            return
+        readme_path = self.path / self.makedoc_paths.autodoc_file_name
+        render_cache = self.makedoc_paths.render_cache
+        inputs_hash = self._render_inputs_hash()
+        if render_cache.is_up_to_date(self.partial_path, inputs_hash, readme_path):
+            return
+        content_hash = self._write_doc_file(readme_path)
+        render_cache.record(self.partial_path, inputs_hash, readme_path, content_hash)
+
+    def update_doc(self, recurse=False, jobs=1, force=False) -> None:
         """Updates the readme file of the directory if it exists.
 
-        Passes otherwise
+        Passes otherwise. Unless force is set, the readme files that are up to
+        date according to the render cache are not rewritten.
         """
 
+        self.run_pipeline(["update"], recurse=recurse, jobs=jobs, force=force)
+
+    def run_pipeline(
+        self,
+        stages: Sequence[str],
+        recurse=False,
+        jobs=1,
+        force=False,
+        changed_paths: Optional[Iterable[str]] = None,
+    ) -> None:
+        """Applies stages to the directory and, if recurse is set, to all its
+        subdirectories, in a single traversal.
+
+        Each directory goes through all the stages, in the given order, before
+        the next one is visited. The packed dirdoc files are only removed once the
+        packed doc is saved, so that the directories not packed yet still see the
+        dirdoc files of their subdirectories.
+
+        When changed paths are given, only the directories of the subtree whose
+        doc may depend on them go through the stages, see _changed_directories.
+
+        Args:
+            stages: Sequence[str]
+                The names of the stages, keys of PIPELINE_STAGES
+            recurse: bool
+                Whether the subdirectories go through the stages too
+            jobs: int
+                The number of processes used to parse independent subtrees
+            force: bool
+                Whether the update stage rewrites the doc files that are up to
+                date according to the render cache
+            changed_paths: Optional[Iterable[str]]
+                The paths that changed since the previous run, which then
+                replace the recursion
+
+        Raises:
+            RuntimeError: if the directory alone is to be packed without any
+                dirdoc file, once the stages that precede the pack are applied
+        """
+        directories = None
+        if changed_paths is not None:
+            directories = self._changed_directories(changed_paths)
+            recurse = True
+        if "pack" in stages and not recurse:
+            try:
+                self._check_packable()
+            except RuntimeError:
+                # The stages that precede the pack are still applied, as when
+                # they were run on their own before it
+                pack_index = list(stages).index("pack")
+                if pack_index:
+                    self.run_pipeline(stages[:pack_index], jobs=jobs, force=force)
+                raise
         if self.source_parser:
             self.logger.add_log(ParsingStartsInfo(*self._message_args))
-        if self.makedoc_paths.autodoc_file_name in os.listdir(self.path):
-            with open(self.path / self.makedoc_paths.autodoc_file_name, "w") as f:
-                f.write(self.get_doc_file_content())
-        if recurse:
-            for child_dir in self.dir_children:
-                child_dir.update_doc(recurse=True)
+        if force and "update" in stages:
+            # Persisted right away so that worker processes see it too
+            self.makedoc_paths.render_cache.clear()
+            self.makedoc_paths.render_cache.flush()
+        actions = [self.PIPELINE_STAGES[stage] for stage in stages]
+        if directories is None:
+            self._apply_with_jobs(actions, recurse=recurse, jobs=jobs)
+        else:
+            for directory in directories:
+                directory._apply(actions)
         if self.source_parser:
             self.logger.add_log(ParsingFinishedSuccess(*self._message_args))
-            self.logger.save_log_file()
-        return
+            self.logger.flush()
+        if self.source_parser or "pack" in stages:
+            self.makedoc_paths.flush_stores()
+
+    def _changed_directories(
+        self, paths: Iterable[str]
+    ) -> Optional[List["DirectoryParser"]]:
+        """Gets the directories of the subtree whose doc may depend on some
+        changed paths: the directories that contain them and all their ancestors,
+        in the order of a recursive run.
+
+        The paths outside the subtree or inside an ignored directory are skipped.
+        A removed directory is represented by its deepest existing ancestor.
+
+        Returns:
+            Optional[List[DirectoryParser]]: the directories, None if a change to
+                the makedoc configuration or packed doc requires the whole subtree
+        """
+        makedoc_dir = str(self.makedoc_paths.packed_doc.parent)
+        directories: Dict[str, DirectoryParser] = {}
+        for path in paths:
+            path = os.path.abspath(path)
+            if path == makedoc_dir or path.startswith(makedoc_dir + os.sep):
+                return None
+            relative_path = os.path.relpath(path, self.path)
+            if relative_path.split(os.sep)[0] == "..":
+                continue
+            lineage = [self]
+            if relative_path != ".":
+                for name in relative_path.split(os.sep):
+                    child = next(
+                        (
+                            child
+                            for child in lineage[-1].dir_children
+                            if child.name == name
+                        ),
+                        None,
+                    )
+                    if child is None:
+                        break
+                    lineage.append(child)
+                else:
+                    name = None
+                if name is not None and os.path.isdir(lineage[-1].path / name):
+                    # An ignored directory, that no doc shows
+                    continue
+            for directory in lineage:
+                directories[directory.partial_path] = directory
+        return [
+            directories[partial_path]
+            for partial_path in sorted(directories, key=lambda x: x.split("/"))
+        ]
 
     def unpack_doc(self, recurse=False) -> None:
         """Creates a file inside the directory that contains the directory doc
@@ -245,19 +714,18 @@ class DirectoryParser(ParserAbstract):
         The content of this file is synced with the content of .makedoc/packed_doc.json
         """
 
-        with open(self.makedoc_paths.packed_doc, "r") as f:
-            packed_doc: Dict[str, str] = json.load(f)
-
-        if self.makedoc_paths.unpacked_doc_file_name in os.listdir(self.path):
+        if self._has_entry(self.makedoc_paths.unpacked_doc_file_name):
             if not recurse:
                 raise RuntimeError("The directory doc is already unpacked")
         else:
             with open(self.path / self.makedoc_paths.unpacked_doc_file_name, "w+") as f:
-                f.write(packed_doc[self.partial_path])
+                f.write(self.makedoc_paths.packed_doc_store[self.partial_path])
 
         if recurse:
             for child in self.dir_children:
                 child.unpack_doc(recurse=True)
+        if self.source_parser:
+            self.makedoc_paths.flush_stores()
 
     def pack_doc(self, recurse=False) -> None:
         """Updates .makedoc/packed_doc.json according to what is contained
@@ -265,24 +733,29 @@ class DirectoryParser(ParserAbstract):
         In the file created by the unpack_doc method.
         """
 
-        if self.makedoc_paths.unpacked_doc_file_name not in os.listdir(self.path):
-            if not recurse:
-                raise RuntimeError("The directory doc is unexisting")
-        else:
-            with open(self.path / self.makedoc_paths.unpacked_doc_file_name, "r") as f:
-                doc = "".join(f.readlines())
-
-            with open(self.makedoc_paths.packed_doc, "r") as f:
-                packed_doc: Dict[str, str] = json.load(f)
-                packed_doc[self.partial_path] = doc
-
-            with open(self.makedoc_paths.packed_doc, "w") as f:
-                json.dump(
-                    packed_doc, f, indent=4, separators=(",", ": "), sort_keys=True
-                )
+        self._check_packable(recurse)
+        self._apply(["_pack_own_doc"], recurse=recurse)
+        # The dirdoc files are only removed once their content is safely saved
+        self.makedoc_paths.flush_stores()
 
-            os.remove(self.path / self.makedoc_paths.unpacked_doc_file_name)
-
-        if recurse:
-            for child in self.dir_children:
-                child.pack_doc(recurse=True)
+    def _check_packable(self, recurse=False) -> None:
+        """Raises an error if the directory alone is to be packed without any
+        dirdoc file
+        """
+        if not recurse and not self._has_entry(
+            self.makedoc_paths.unpacked_doc_file_name
+        ):
+            raise RuntimeError("The directory doc is unexisting")
+
+    def _pack_own_doc(self) -> None:
+        """Packs the dirdoc file of the directory only, if there is one, into the
+        packed doc store
+        """
+        if self._has_entry(self.makedoc_paths.unpacked_doc_file_name):
+            dirdoc_path = self.path / self.makedoc_paths.unpacked_doc_file_name
+            with open(dirdoc_path, "r") as f:
+                doc = "".join(f.readlines())
+            self.makedoc_paths.packed_doc_store.pack(
+                self.partial_path, doc, dirdoc_path
+            )
+            self._dirdoc_packed = True
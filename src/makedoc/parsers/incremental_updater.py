@@ -0,0 +1,224 @@
+"""Implements the incremental update of the doc files of a tree, from the list of
+the paths that changed since the previous update.
+"""
+
+import os
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from makedoc import git
+
+from .directory_parser import DirectoryParser
+from .tree_listing import TreeListing
+
+
+class IncrementalUpdater(object):
+    """Keeps a parsed tree in memory and updates it as its files change.
+
+    Only the touched nodes are parsed again, and only the doc files that depend on
+    them are rewritten:
+        - a modified file changes the doc of its directory
+        - a modified dirdoc changes the doc of its directory and of its parent
+        - an added or removed entry changes the structure of its directory and of
+        all its ancestors
+        - a doc file added or edited by hand is written again, the events of the
+        doc files makedoc writes being told apart by their stat in the render cache
+    Changes to the makedoc configuration, or to the .gitignore file when it is
+    honored, cannot be applied incrementally: the tree has to be built again, which
+    is signaled by needs_reload.
+
+    The entries of a tree built from the git index are those git tracks. A change
+    to the index, or an entry added or removed, gets them listed again, and the
+    tree is built again if they differ.
+    """
+
+    def __init__(self, parser: DirectoryParser) -> None:
+        self.parser = parser
+        self.makedoc_paths = parser.makedoc_paths
+        self.needs_reload: bool = False
+        # The file git writes when the tracked files change, if the tree is
+        # built from the git index
+        self.git_index_path: Optional[str] = (
+            None if parser.tree_listing is None else git.index_path(str(parser.path))
+        )
+
+    def iter_directories(
+        self, directory: Optional[DirectoryParser] = None
+    ) -> Iterator[DirectoryParser]:
+        """Iterates over the directories of a subtree, the whole tree by default,
+        in pre-order
+        """
+        stack = [self.parser if directory is None else directory]
+        while stack:
+            directory = stack.pop()
+            yield directory
+            stack.extend(reversed(directory.dir_children))
+
+    def _find_lineage(self, path: str) -> Optional[List[DirectoryParser]]:
+        """Gets the parsers of a directory of the tree and of its ancestors, from
+        the root of the tree. None if the directory is not part of the tree.
+        """
+        relative_path = os.path.relpath(path, self.parser.path)
+        lineage = [self.parser]
+        if relative_path == ".":
+            return lineage
+        if relative_path.split(os.sep)[0] == "..":
+            return None
+        for name in relative_path.split(os.sep):
+            for child in lineage[-1].dir_children:
+                if child.name == name:
+                    lineage.append(child)
+                    break
+            else:
+                return None
+        return lineage
+
+    def _is_temporary_output(self, name: str) -> bool:
+        """Checks if a file is a temporary file makedoc writes a doc file through"""
+        autodoc_file_name = self.makedoc_paths.autodoc_file_name
+        return name.startswith("." + autodoc_file_name + ".") and name.endswith(".tmp")
+
+    def _apply_makedoc_change(self, path: str) -> Dict[str, DirectoryParser]:
+        """Handles a change inside the .makedoc directory
+
+        Returns:
+            Dict[str, DirectoryParser]: the directories to update, by partial path
+        """
+        if path.startswith(str(self.makedoc_paths.config)):
+            self.needs_reload = True
+            return {}
+        store = self.makedoc_paths.packed_doc_store
+        if path != str(store.path):
+            return {}
+        # The packed doc may have been edited by hand or by a version control
+        # operation. Saving it from memory also triggers this event, in which
+        # case nothing changed.
+        try:
+            packed_doc = store.read_all()
+        except (OSError, ValueError):
+            return {}
+        to_update = {}
+        for directory in self.iter_directories():
+            partial_path = directory.partial_path
+            if packed_doc.get(partial_path) == store.get(partial_path):
+                continue
+            for ancestor in self._find_lineage(str(directory.path))[-2:]:
+                to_update[ancestor.partial_path] = ancestor
+        store.entries.update(packed_doc)
+        return to_update
+
+    def apply_changes(self, paths: Iterable[str]) -> List[DirectoryParser]:
+        """Updates the tree and the doc files after some paths were modified.
+
+        Args:
+            paths: Iterable[str]
+                The absolute paths that were created, modified or removed
+
+        Returns:
+            List[DirectoryParser]: the directories that were added to the tree
+        """
+        makedoc_dir = str(self.makedoc_paths.packed_doc.parent)
+        to_update: Dict[str, DirectoryParser] = {}
+        to_refresh: Dict[str, List[DirectoryParser]] = {}
+        tracked_files_may_change = False
+        for path in paths:
+            if path == self.git_index_path:
+                tracked_files_may_change = True
+                continue
+            if path == makedoc_dir or path.startswith(makedoc_dir + os.sep):
+                to_update.update(self._apply_makedoc_change(path))
+                continue
+            if (
+                path == str(self.makedoc_paths.gitignore)
+                and self.makedoc_paths.uses_gitignore
+            ):
+                self.needs_reload = True
+                continue
+            name = os.path.basename(path)
+            if self._is_temporary_output(name):
+                continue
+            lineage = self._find_lineage(os.path.dirname(path))
+            if lineage is None:
+                continue
+            directory = lineage[-1]
+            if name == self.makedoc_paths.autodoc_file_name:
+                if self.makedoc_paths.render_cache.is_recorded_output(
+                    directory.partial_path, path
+                ):
+                    # Written by makedoc itself
+                    continue
+                # Added, removed or edited by hand, the doc file is written again if
+                # it is there
+                to_update[directory.partial_path] = directory
+            if name == self.makedoc_paths.unpacked_doc_file_name:
+                for ancestor in lineage[-2:]:
+                    to_update[ancestor.partial_path] = ancestor
+            elif self._is_structure_change(directory, path, name):
+                if self.parser.tree_listing is None:
+                    to_refresh[directory.partial_path] = lineage
+                else:
+                    tracked_files_may_change = True
+            elif name in directory.file_names:
+                for file in directory.doc_file_children:
+                    if file.name == name:
+                        file.parsed_doc = ""
+                to_update[directory.partial_path] = directory
+
+        if tracked_files_may_change and self._tracked_files_changed():
+            self.needs_reload = True
+
+        new_directories = []
+        for lineage in to_refresh.values():
+            directory = lineage[-1]
+            if not os.path.isdir(directory.path):
+                # Removed along with its content, its parent is refreshed instead
+                continue
+            previous_dir_children = set(map(id, directory.dir_children))
+            directory.refresh_children()
+            new_directories += [
+                child
+                for child in directory.dir_children
+                if id(child) not in previous_dir_children
+            ]
+            for ancestor in lineage:
+                ancestor.forget_structure()
+                to_update[ancestor.partial_path] = ancestor
+
+        for new_directory in new_directories:
+            for directory in self.iter_directories(new_directory):
+                to_update[directory.partial_path] = directory
+
+        for directory in to_update.values():
+            directory._update_own_doc()
+        self.makedoc_paths.flush_stores()
+        self.parser.logger.flush()
+        return new_directories
+
+    def _tracked_files_changed(self) -> bool:
+        """Checks if the files git tracks differ from the listing the tree was
+        built from
+        """
+        tree_listing = TreeListing.from_git_index(
+            self.parser.path, self.parser.root_path
+        )
+        return tree_listing.directories != self.parser.tree_listing.directories
+
+    def _is_structure_change(
+        self, directory: DirectoryParser, path: str, name: str
+    ) -> bool:
+        """Checks if a change to an entry of a directory adds or removes a child"""
+        if any(child.name == name for child in directory.dir_children):
+            is_dir_child: Optional[bool] = True
+        elif name in directory.file_names:
+            is_dir_child = False
+        else:
+            is_dir_child = None
+        if not os.path.lexists(path):
+            return is_dir_child is not None
+        if is_dir_child is None:
+            partial_path = (
+                directory.partial_path + "/" + name if directory.partial_path else name
+            )
+            return not self.makedoc_paths.ignore_rules.is_ignored(
+                path, partial_path, name, os.path.isfile(path)
+            )
+        return os.path.isdir(path) != is_dir_child
@@ -0,0 +1,196 @@
+"""Implements the distribution of directory parsing over a pool of processes"""
+
+import pathlib
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, NamedTuple, Optional, Sequence, Type
+
+from makedoc.logging.logger import Logger
+from makedoc.logging.messages.concept.message_abstract import MessageAbstract
+from makedoc.logging.metrics import Metrics
+from makedoc.makedoc_paths import MakedocPaths
+from makedoc.parse_cache import ParseCacheChanges
+
+from .arborescence import ArborescenceEntry
+from .tree_listing import TreeListing
+
+# Number of subtrees handed to each worker, to balance uneven subtrees
+TASKS_PER_JOB = 4
+
+
+class SubtreeResult(NamedTuple):
+    """What a worker process sends back after parsing a subtree"""
+
+    messages: List[MessageAbstract]
+    packed_doc_entries: Dict[str, str]
+    packed_file_paths: List[pathlib.Path]
+    render_cache_entries: Dict[str, Dict]
+    parse_cache_changes: ParseCacheChanges
+    arborescence_entries: List[ArborescenceEntry]
+    metrics: Metrics
+
+
+def _parse_subtree(
+    parser_class: Type,
+    path: pathlib.Path,
+    root_path: pathlib.Path,
+    actions: Sequence[str],
+    tree_listing: Optional[TreeListing],
+) -> SubtreeResult:
+    """Parses a subtree in a worker process
+
+    Args:
+        parser_class: Type[DirectoryParser]
+            The class of the subtree parser
+        path: pathlib.Path
+            The path of the subtree root directory
+        root_path: pathlib.Path
+            The path of the makedoc project
+        actions: Sequence[str]
+            The names of the DirectoryParser methods to apply in order to every
+            directory of the subtree. When empty, only the subtree structure is
+            built.
+        tree_listing: Optional[TreeListing]
+            The listing of the subtree, None to list it on the file system
+    """
+    makedoc_paths = MakedocPaths(root_path)
+    logger = Logger(makedoc_paths, in_memory=True)
+    parser = parser_class(
+        path=path,
+        root_path=root_path,
+        logger=logger,
+        makedoc_path=makedoc_paths,
+        lazy=True,
+        tree_listing=tree_listing,
+    )
+    if actions:
+        parser._apply(actions, recurse=True)
+    arborescence_entries = parser.arborescence_entries
+
+    for msg in logger.log_list:
+        msg.makedoc_paths = None
+    packed_doc_store = makedoc_paths.packed_doc_store
+    render_cache = makedoc_paths.render_cache
+    return SubtreeResult(
+        messages=logger.log_list,
+        packed_doc_entries={
+            key: packed_doc_store[key] for key in packed_doc_store.dirty_keys
+        },
+        packed_file_paths=packed_doc_store.packed_file_paths,
+        render_cache_entries={
+            key: render_cache.entries[key] for key in render_cache.dirty_keys
+        },
+        parse_cache_changes=makedoc_paths.parse_cache.changes,
+        arborescence_entries=arborescence_entries,
+        metrics=logger.metrics,
+    )
+
+
+def _split_subtrees(parser, jobs: int) -> List:
+    """Selects the subtrees to hand to the workers
+
+    The tree is expanded level by level until there are enough subtrees to keep
+    all the workers busy. The directories above the selected subtrees are left to
+    the main process.
+    """
+    subtrees = parser.dir_children
+    while len(subtrees) < TASKS_PER_JOB * jobs:
+        next_subtrees = [
+            child for subtree in subtrees for child in subtree.dir_children
+        ]
+        if not next_subtrees:
+            break
+        subtrees = next_subtrees
+    return subtrees
+
+
+def _run_in_pool(parser, subtrees: List, actions: Sequence[str], jobs: int) -> Dict:
+    """Parses the subtrees in a pool of processes and merges back the packed doc
+    entries and files, the render and parse caches changes, the arborescences and
+    the metrics.
+
+    Returns:
+        Dict[int, SubtreeResult]: the results, indexed by the id of the subtrees
+    """
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        futures = {
+            id(subtree): pool.submit(
+                _parse_subtree,
+                type(subtree),
+                subtree.path,
+                subtree.root_path,
+                actions,
+                None
+                if subtree.tree_listing is None
+                else subtree.tree_listing.subtree(subtree.partial_path),
+            )
+            for subtree in subtrees
+        }
+        results = {key: future.result() for key, future in futures.items()}
+
+    packed_doc_store = parser.makedoc_paths.packed_doc_store
+    render_cache = parser.makedoc_paths.render_cache
+    parse_cache = parser.makedoc_paths.parse_cache
+    for subtree in subtrees:
+        result = results[id(subtree)]
+        for key, doc in result.packed_doc_entries.items():
+            packed_doc_store[key] = doc
+        packed_doc_store.packed_file_paths += result.packed_file_paths
+        for key, entry in result.render_cache_entries.items():
+            render_cache.set_entry(key, entry)
+        parse_cache.merge(result.parse_cache_changes)
+        parser.logger.metrics.merge(result.metrics)
+        subtree._arborescence = (
+            result.arborescence_entries,
+            0,
+            len(result.arborescence_entries),
+        )
+    return results
+
+
+def _add_messages(parser, result: SubtreeResult) -> None:
+    """Hands the messages of a worker to the logger of the main process"""
+    for msg in result.messages:
+        msg.makedoc_paths = parser.makedoc_paths
+        parser.logger.add_log(msg)
+
+
+def prefetch_structures(parser, jobs: int) -> None:
+    """Builds the structure of every subdirectory of the parser in a pool of
+    processes, so that rendering the parser doc does not walk the whole subtree.
+    """
+    subtrees = parser.dir_children
+    results = _run_in_pool(parser, subtrees, [], jobs)
+    for subtree in subtrees:
+        _add_messages(parser, results[id(subtree)])
+
+
+def apply_in_pool(parser, actions: Sequence[str], jobs: int) -> None:
+    """Applies actions to every directory of the parser subtree, with the
+    independent subtrees parsed in a pool of processes.
+
+    The messages are logged in the same order as a serial run would log them,
+    and the written files are identical.
+
+    Args:
+        parser: DirectoryParser
+            The root of the tree to parse
+        actions: Sequence[str]
+            The names of the DirectoryParser methods to apply in order to every
+            directory
+        jobs: int
+            The number of worker processes
+    """
+    subtrees = _split_subtrees(parser, jobs)
+    results = _run_in_pool(parser, subtrees, actions, jobs)
+
+    def walk(node) -> None:
+        result = results.get(id(node))
+        if result is not None:
+            _add_messages(parser, result)
+            return
+        for action in actions:
+            getattr(node, action)()
+        for child in node.dir_children:
+            walk(child)
+
+    walk(parser)
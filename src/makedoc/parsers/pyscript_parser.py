@@ -1,9 +1,13 @@
 """
 Implements a parser class for python scripts
 """
-from typing import List
+
+import contextlib
+import os
+from typing import Iterator, List, Optional
 
 from makedoc.logging.messages.warnings import EmptyPyFileDocstringWarning
+from makedoc.parse_cache import ParsedDocstring
 
 from .concept import FileParserAbstract
 
@@ -11,6 +15,11 @@ from .concept import FileParserAbstract
 class PyscriptParser(FileParserAbstract):
     """Parser class for pathyon scripts"""
 
+    __slots__ = ()
+
+    # The number of characters read at most while looking for the docstring
+    MAX_DOCSTRING_SEARCH_CHARS: int = 1 << 20
+
     def __init__(self, **kwargs):
         super(PyscriptParser, self).__init__(**kwargs)
 
@@ -24,14 +33,61 @@ class PyscriptParser(FileParserAbstract):
             self.parsed_doc += "\n\n".join(self.get_file_beginning_comment_lines())
         return self.parsed_doc
 
+    @property
+    def doc_fingerprint(self) -> str:
+        """The doc only changes with the file, identified by its mtime and size"""
+        stat = os.stat(self.path)
+        return f"{stat.st_mtime_ns}:{stat.st_size}"
+
     def get_file_beginning_comment_lines(self) -> List[str]:
         """Gets the beginning of file docstrings if applicable
 
+        The docstring of a file that did not change since the previous run is
+        taken from the parse cache instead of being read again.
+
         Returns
             List[str] : The line-wise list of all comments of the beginning of
                 the file.
         """
-        lines = self.content_txt_lines
+        metrics = self.logger.metrics
+        parse_start = metrics.start()
+        stat = os.stat(self.path)
+        parse_cache = self.makedoc_paths.parse_cache
+        entry = parse_cache.get(self.partial_path, stat.st_mtime_ns, stat.st_size)
+        if entry is None:
+            with contextlib.closing(
+                self.iter_content_txt_lines(max_chars=self.MAX_DOCSTRING_SEARCH_CHARS)
+            ) as lines:
+                entry = ParsedDocstring(
+                    stat.st_mtime_ns,
+                    stat.st_size,
+                    self._find_beginning_comment_lines(lines),
+                )
+            parse_cache.put(self.partial_path, entry)
+            metrics.count("files-read")
+        metrics.stop("parse", parse_start)
+
+        if entry.lines is None:
+            self.logger.add_log(
+                EmptyPyFileDocstringWarning(
+                    file_path_str=self.partial_path, makedoc_paths=self.makedoc_paths
+                )
+            )
+            return []
+        return entry.lines
+
+    def _find_beginning_comment_lines(
+        self, lines: Iterator[str]
+    ) -> Optional[List[str]]:
+        """Consumes the lines of the file until the end of its first docstring
+
+        Only the lines that precede the end of the docstring are read, so large
+        files are not read as a whole.
+
+        Returns
+            Optional[List[str]] : The lines of the docstring, None if the file has
+                no docstring.
+        """
         file_beginning_comment_lines = []
         comment_marker = None
 
@@ -59,9 +115,4 @@ class PyscriptParser(FileParserAbstract):
                 else:
                     file_beginning_comment_lines.append(line.rstrip())
 
-        self.logger.add_log(
-            EmptyPyFileDocstringWarning(
-                file_path_str=self.partial_path, makedoc_paths=self.makedoc_paths
-            )
-        )
-        return []
+        return None
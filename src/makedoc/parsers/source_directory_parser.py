@@ -6,22 +6,30 @@ Implements a parser class for the source directory of a project
 """
 
 import json
+from typing import Optional
 
 from makedoc.parsers.concept.parser_abstract import MakedocPaths
 
 from .directory_parser import DirectoryParser
+from .tree_listing import TreeListing
 
 
 class SourceDirectoryParser(DirectoryParser):
     """Parser class for the source directory"""
 
-    def __init__(self, path):
+    __slots__ = ()
 
-        self.makedoc_paths = MakedocPaths(path)
-        self._init_makedoc_file_structure()
+    def __init__(self, path, tree_listing: Optional[TreeListing] = None):
+
+        makedoc_paths = MakedocPaths(path)
+        self._init_makedoc_file_structure(makedoc_paths)
         super(SourceDirectoryParser, self).__init__(
-            path=path, root_path=path, makedoc_path=self.makedoc_paths
+            path=path,
+            root_path=path,
+            makedoc_path=makedoc_paths,
+            tree_listing=tree_listing,
         )
+        self.makedoc_paths.flush_stores()
 
     def get_partial_path(self) -> str:
         """Returns the partial path of the parser"""
@@ -34,17 +42,18 @@ class SourceDirectoryParser(DirectoryParser):
         """
         return False
 
-    def _init_makedoc_file_structure(self):
+    @staticmethod
+    def _init_makedoc_file_structure(makedoc_paths: MakedocPaths):
         """Initialises the .makedoc folder"""
 
-        if not self.makedoc_paths.packed_doc.exists():
-            self.makedoc_paths.packed_doc.parent.mkdir(exist_ok=True, parents=True)
-            with open(self.makedoc_paths.packed_doc, "w+") as f:
+        if not makedoc_paths.packed_doc.exists():
+            makedoc_paths.packed_doc.parent.mkdir(exist_ok=True, parents=True)
+            with open(makedoc_paths.packed_doc, "w+") as f:
                 f.write("{\n}")
-        self.makedoc_paths.config.mkdir(exist_ok=True)  # Create the config folder
+        makedoc_paths.config.mkdir(exist_ok=True)  # Create the config folder
 
-        if not self.makedoc_paths.files_naming.exists():
-            with open(self.makedoc_paths.files_naming, "w+") as f:
+        if not makedoc_paths.files_naming.exists():
+            with open(makedoc_paths.files_naming, "w+") as f:
                 json.dump(
                     {
                         "unpacked_doc_file_name": "dirdoc.makedoc.md",
@@ -57,8 +66,8 @@ class SourceDirectoryParser(DirectoryParser):
                 )
 
         # Ignored files and directories initialisation
-        if not self.makedoc_paths.ignored_path.exists():
-            with open(self.makedoc_paths.ignored_path, "w+") as f:
+        if not makedoc_paths.ignored_path.exists():
+            with open(makedoc_paths.ignored_path, "w+") as f:
                 f.write(
                     "###################################################\n"
                     "# This file shall contain all ignored directories\n"
@@ -67,6 +76,10 @@ class SourceDirectoryParser(DirectoryParser):
                     "# Every path that matches those relative or absolute\n"
                     "# paths are to be ignored in both structure representation\n"
                     "# and README documentation.\n"
+                    "# \n"
+                    "# The lines with *, ? or [, or starting with !, are\n"
+                    "# .gitignore-style patterns, such as **/build/, unless\n"
+                    "# they are the path of an existing file or directory\n"
                     "###################################################\n"
                     "\n"
                     ".git\n"
@@ -83,8 +96,8 @@ class SourceDirectoryParser(DirectoryParser):
                     "# AUTO ADDED:\n"
                 )
 
-        if not self.makedoc_paths.ignored_every.exists():
-            with open(self.makedoc_paths.ignored_every, "w+") as f:
+        if not makedoc_paths.ignored_every.exists():
+            with open(makedoc_paths.ignored_every, "w+") as f:
                 f.write(
                     "###################################################\n"
                     "# This file shall contain all ignored directories\n"
@@ -102,8 +115,8 @@ class SourceDirectoryParser(DirectoryParser):
                     "# AUTO ADDED:\n"
                 )
 
-        if not self.makedoc_paths.ignored_extensions.exists():
-            with open(self.makedoc_paths.ignored_extensions, "w+") as f:
+        if not makedoc_paths.ignored_extensions.exists():
+            with open(makedoc_paths.ignored_extensions, "w+") as f:
                 f.write(
                     "###################################################\n"
                     "# This file shall contain all ignored file \n"
@@ -117,16 +130,36 @@ class SourceDirectoryParser(DirectoryParser):
                     "txt\n"
                 )
 
-        if not self.makedoc_paths.config_json.exists():
+        if not makedoc_paths.config_json.exists():
             default_config = {
                 "verbosity": {
                     "print-warning": True,
                     "print-error": True,
                     "print-info": True,
                     "print-success": True,
-                }
+                    "summary-only": False,
+                },
+                "output": {
+                    "keep-unchanged-date": True,
+                },
+                "logs": {
+                    "jsonl": False,
+                },
+                "parse-cache": {
+                    "enabled": True,
+                    "max-bytes": 64 << 20,
+                },
+                "tree": {
+                    "source": "filesystem",
+                },
+                "packed-doc": {
+                    "backend": "json",
+                },
+                "ignore": {
+                    "gitignore": False,
+                },
             }
-            with open(self.makedoc_paths.config_json, "w+") as f:
+            with open(makedoc_paths.config_json, "w+") as f:
                 json.dump(
                     default_config, f, sort_keys=True, indent=4, separators=(",", ": ")
                 )
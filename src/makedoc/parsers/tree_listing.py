@@ -0,0 +1,86 @@
+"""Implements the listing of a tree known beforehand, that parsers can be built
+from instead of listing the directories on the file system.
+"""
+
+import pathlib
+from typing import Dict, Iterable
+
+from makedoc import git
+
+
+class TreeListing(object):
+    """The entries of every directory of a tree.
+
+    The entries of a directory are found by its partial path, along with whether
+    they are directories themselves. A directory missing from the listing is
+    empty.
+    """
+
+    __slots__ = ("directories",)
+
+    def __init__(self, directories: Dict[str, Dict[str, bool]]) -> None:
+        self.directories = directories
+
+    def entries(self, partial_path: str) -> Dict[str, bool]:
+        """Gets the entries of a directory, and whether they are directories"""
+        return self.directories.get(partial_path, {})
+
+    def subtree(self, partial_path: str) -> "TreeListing":
+        """Gets the listing of a subtree, to be sent to a worker process"""
+        prefix = partial_path + "/"
+        return TreeListing(
+            {
+                key: entries
+                for key, entries in self.directories.items()
+                if key == partial_path or key.startswith(prefix)
+            }
+        )
+
+    @classmethod
+    def from_file_paths(
+        cls, file_paths: Iterable[str], partial_path: str
+    ) -> "TreeListing":
+        """Builds the listing of a directory from the paths of all its files
+
+        Args:
+            file_paths: Iterable[str]
+                The paths of the files, relative to the directory
+            partial_path: str
+                The partial path of the directory
+        """
+        directories: Dict[str, Dict[str, bool]] = {partial_path: {}}
+
+        def add_directory(directory: str) -> Dict[str, bool]:
+            entries: Dict[str, bool] = {}
+            directories[directory] = entries
+            parent, _, name = directory.rpartition("/")
+            parent_entries = directories.get(parent)
+            if parent_entries is None:
+                parent_entries = add_directory(parent)
+            parent_entries[name] = True
+            return entries
+
+        prefix = partial_path + "/" if partial_path else ""
+        for file_path in file_paths:
+            directory, _, name = (prefix + file_path).rpartition("/")
+            entries = directories.get(directory)
+            if entries is None:
+                entries = add_directory(directory)
+            entries[name] = False
+        return cls(directories)
+
+    @classmethod
+    def from_git_index(
+        cls, path: pathlib.Path, root_path: pathlib.Path
+    ) -> "TreeListing":
+        """Builds the listing of a directory from the files git tracks, with a
+        single git command and without listing any directory
+
+        Args:
+            path: pathlib.Path
+                The absolute path of the directory
+            root_path: pathlib.Path
+                The path of the makedoc project
+        """
+        partial_path = str(path.absolute())[len(str(root_path.absolute())) + 1 :]
+        return cls.from_file_paths(git.tracked_files(str(path)), partial_path)
@@ -0,0 +1,115 @@
+"""Implements a persistent cache of the rendered doc files"""
+
+import hashlib
+import json
+import os
+import pathlib
+from typing import Dict, Optional, Set, Union
+
+from makedoc import __VERSION__
+from makedoc.utils.atomic_file import write_atomically
+
+
+def hash_text(text: str) -> str:
+    """Gets the hexadecimal sha1 hash of a string"""
+    return hashlib.sha1(text.encode()).hexdigest()
+
+
+class RenderCache(object):
+    """Records, for every directory, what its doc file was rendered from.
+
+    The cache is stored in .makedoc/render_cache.json. Each entry is keyed by the
+    directory partial path and holds:
+        - inputs: the hash of everything the doc file content depends on
+        - output: the hash of the content that was written
+        - mtime_ns, size: the stat of the doc file right after it was written
+
+    A doc file is up to date when its inputs did not change and the file was not
+    modified since makedoc wrote it. The cache is discarded when the makedoc version
+    changes.
+    """
+
+    def __init__(self, cache_path: pathlib.Path) -> None:
+        self.cache_path = cache_path
+        self._entries: Optional[Dict[str, Dict]] = None
+        self.dirty_keys: Set[str] = set()
+        self._cleared: bool = False
+
+    @property
+    def entries(self) -> Dict[str, Dict]:
+        """Gets the cache entries, reading the cache file if needed"""
+        if self._entries is None:
+            self._entries = {}
+            if self.cache_path.exists():
+                with open(self.cache_path, "r") as f:
+                    content = json.load(f)
+                if content.get("version") == list(__VERSION__):
+                    self._entries = content["entries"]
+        return self._entries
+
+    def is_up_to_date(
+        self, partial_path: str, inputs_hash: str, output_path: pathlib.Path
+    ) -> bool:
+        """Checks if a doc file was rendered from the same inputs and left untouched"""
+        entry = self.entries.get(partial_path)
+        if entry is None or entry["inputs"] != inputs_hash:
+            return False
+        return self.is_recorded_output(partial_path, output_path)
+
+    def is_recorded_output(
+        self, partial_path: str, output_path: Union[str, pathlib.Path]
+    ) -> bool:
+        """Checks if a doc file is left as makedoc last wrote it, by its stat"""
+        entry = self.entries.get(partial_path)
+        if entry is None:
+            return False
+        try:
+            stat = os.stat(output_path)
+        except FileNotFoundError:
+            return False
+        return entry["mtime_ns"] == stat.st_mtime_ns and entry["size"] == stat.st_size
+
+    def record(
+        self,
+        partial_path: str,
+        inputs_hash: str,
+        output_path: pathlib.Path,
+        output_hash: str,
+    ) -> None:
+        """Records that a doc file was just written from the given inputs"""
+        stat = os.stat(output_path)
+        self.set_entry(
+            partial_path,
+            {
+                "inputs": inputs_hash,
+                "output": output_hash,
+                "mtime_ns": stat.st_mtime_ns,
+                "size": stat.st_size,
+            },
+        )
+
+    def set_entry(self, partial_path: str, entry: Dict) -> None:
+        """Sets the raw entry of a directory"""
+        self.entries[partial_path] = entry
+        self.dirty_keys.add(partial_path)
+
+    def clear(self) -> None:
+        """Forgets every entry"""
+        self._entries = {}
+        self.dirty_keys.clear()
+        self._cleared = True
+
+    def flush(self) -> None:
+        """Writes the cache file if some entries were modified"""
+        if not self.dirty_keys and not self._cleared:
+            return
+        write_atomically(
+            self.cache_path,
+            lambda f: json.dump(
+                {"version": list(__VERSION__), "entries": self.entries},
+                f,
+                sort_keys=True,
+            ),
+        )
+        self.dirty_keys.clear()
+        self._cleared = False
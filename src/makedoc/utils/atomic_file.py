@@ -0,0 +1,34 @@
+"""Implements atomic file writing: a file is either fully rewritten or untouched"""
+
+import os
+import pathlib
+import tempfile
+from typing import Callable, TextIO
+
+
+def write_atomically(path: pathlib.Path, write: Callable[[TextIO], None]) -> None:
+    """Writes a file through a temporary file that then replaces it
+
+    Args:
+        path: pathlib.Path
+            The path of the file to write
+        write: Callable[[TextIO], None]
+            The function that writes the content into the opened temporary file
+    """
+    fd, tmp_path = tempfile.mkstemp(
+        dir=path.parent, prefix="." + path.name + ".", suffix=".tmp"
+    )
+    try:
+        with os.fdopen(fd, "w") as f:
+            write(f)
+        # mkstemp creates files readable by the owner only
+        if path.exists():
+            os.chmod(tmp_path, path.stat().st_mode & 0o777)
+        else:
+            umask = os.umask(0)
+            os.umask(umask)
+            os.chmod(tmp_path, 0o666 & ~umask)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
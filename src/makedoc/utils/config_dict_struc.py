@@ -11,7 +11,62 @@ CfgVerbosityDict = TypedDict(
         "print-error": bool,
         "print-info": bool,
         "print-success": bool,
+        "summary-only": bool,
     },
 )
 
-CfgDict = TypedDict("ConfigDict", {"verbosity": CfgVerbosityDict})
+CfgOutputDict = TypedDict(
+    "CfgOutputDict",
+    {
+        "keep-unchanged-date": bool,
+    },
+)
+
+CfgParseCacheDict = TypedDict(
+    "CfgParseCacheDict",
+    {
+        "enabled": bool,
+        "max-bytes": int,
+    },
+)
+
+CfgLogsDict = TypedDict(
+    "CfgLogsDict",
+    {
+        "jsonl": bool,
+    },
+)
+
+CfgIgnoreDict = TypedDict(
+    "CfgIgnoreDict",
+    {
+        "gitignore": bool,
+    },
+)
+
+CfgPackedDocDict = TypedDict(
+    "CfgPackedDocDict",
+    {
+        "backend": str,
+    },
+)
+
+CfgTreeDict = TypedDict(
+    "CfgTreeDict",
+    {
+        "source": str,
+    },
+)
+
+CfgDict = TypedDict(
+    "ConfigDict",
+    {
+        "verbosity": CfgVerbosityDict,
+        "output": CfgOutputDict,
+        "parse-cache": CfgParseCacheDict,
+        "logs": CfgLogsDict,
+        "tree": CfgTreeDict,
+        "packed-doc": CfgPackedDocDict,
+        "ignore": CfgIgnoreDict,
+    },
+)
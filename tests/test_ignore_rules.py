@@ -0,0 +1,50 @@
+import pathlib
+
+from makedoc.ignore_rules import GlobRules, IgnoreRules
+
+
+def _ignored_paths_rules(root: pathlib.Path, *lines: str) -> IgnoreRules:
+    return IgnoreRules(
+        [line + "\n" for line in lines], [], [], "README.md", root_path=root
+    )
+
+
+def _is_ignored(rules: IgnoreRules, root: pathlib.Path, partial_path: str) -> bool:
+    path = root / partial_path
+    return rules.is_ignored(path, partial_path, path.name, path.is_file())
+
+
+def test_existing_path_with_brackets_is_literal(tmp_path):
+    (tmp_path / "docs" / "[draft]").mkdir(parents=True)
+    (tmp_path / "docs" / "d").mkdir()
+    rules = _ignored_paths_rules(tmp_path, "docs/[draft]")
+    assert rules.glob_rules is None
+    assert _is_ignored(rules, tmp_path, "docs/[draft]")
+    assert not _is_ignored(rules, tmp_path, "docs/d")
+
+
+def test_missing_path_with_brackets_is_a_pattern(tmp_path):
+    (tmp_path / "docs" / "d").mkdir(parents=True)
+    (tmp_path / "docs" / "x").mkdir()
+    rules = _ignored_paths_rules(tmp_path, "docs/[draft]")
+    assert _is_ignored(rules, tmp_path, "docs/d")
+    assert not _is_ignored(rules, tmp_path, "docs/x")
+
+
+def test_last_matching_pattern_wins():
+    rules = GlobRules(["*.log", "!keep/*.log", "keep/old_*.log", "build/**"])
+    assert rules.is_ignored("a/b.log", True)
+    assert not rules.is_ignored("keep/b.log", True)
+    assert rules.is_ignored("keep/old_b.log", True)
+    assert rules.is_ignored("build/x/y.py", True)
+    assert not rules.is_ignored("build", False)
+
+
+def test_directory_patterns():
+    rules = GlobRules(["**/cache/", "/out/*.txt", "[!a]?"])
+    assert rules.is_ignored("src/cache", False)
+    assert not rules.is_ignored("src/cache", True)
+    assert rules.is_ignored("out/a.txt", True)
+    assert not rules.is_ignored("src/out/a.txt", True)
+    assert rules.is_ignored("src/bc", True)
+    assert not rules.is_ignored("src/ac", True)